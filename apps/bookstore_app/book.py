@@ -1,15 +1,47 @@
 # book.py
 
+import sys
 from colorama import Fore, Style
 import math # Will be used for price rounding if needed
+from shared.utils import normalize_key
+
+def book_key(title, author):
+    """Builds the normalized (title, author) key used for duplicate checks and exact lookups."""
+    return (normalize_key(title), normalize_key(author))
 
 class Book:
+    # Fixed attribute layout (no per-instance __dict__) keeps large catalogs small in memory
+    __slots__ = ('title', '_author', '_price_cents', 'stock')
+
     def __init__(self, title, author, price, stock):
         self.title = self._validate_string_input(title, "Title")
         self.author = self._validate_string_input(author, "Author")
         self.price = self._validate_price(price)
         self.stock = self._validate_stock(stock)
 
+    @property
+    def author(self):
+        return self._author
+
+    @author.setter
+    def author(self, value):
+        # Many books share an author, so interning stores each name only once
+        self._author = sys.intern(value)
+
+    @property
+    def price(self):
+        """Price in euros, as a float rounded to cents."""
+        return self._price_cents / 100
+
+    @price.setter
+    def price(self, value):
+        self._price_cents = round(value * 100) # Stored as whole cents: a small int, no float drift
+
+    @property
+    def price_cents(self):
+        """Price in whole cents, handy for exact arithmetic."""
+        return self._price_cents
+
     @staticmethod
     def _validate_string_input(value, field_name):
         """Validates if a string input is not empty and is a string."""
@@ -48,8 +80,12 @@ class Book:
 
     def __str__(self):
         """String representation for printing the object directly."""
-        return (f"{Fore.YELLOW}{self.title}{Style.RESET_ALL} by {self.author} - "
-                f"€{self.price:.2f} ({self.stock} in stock)")
+        return self.format_line()
+
+    def format_line(self, color=True):
+        """One-line summary; with color=False no ANSI codes are built (for pipes and files)."""
+        title = f"{Fore.YELLOW}{self.title}{Style.RESET_ALL}" if color else self.title
+        return f"{title} by {self.author} - €{self.price:.2f} ({self.stock} in stock)"
 
     def to_dict(self):
         """Converts the Book object to a dictionary for JSON serialization."""
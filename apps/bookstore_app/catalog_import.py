@@ -0,0 +1,44 @@
+# apps/bookstore_app/catalog_import.py
+
+import csv
+import json
+from pathlib import Path
+from shared.importing import ImportReport # Re-exported for existing imports
+
+BOOK_FIELDS = ('title', 'author', 'price', 'stock')
+SUPPORTED_FORMATS = ('csv', 'jsonl')
+
+def detect_format(source, fmt=None):
+    """Works out whether a source is CSV or JSONL, from `fmt` or the file extension."""
+    if fmt is None:
+        name = source if isinstance(source, (str, Path)) else getattr(source, 'name', '')
+        fmt = Path(str(name)).suffix.lstrip('.')
+    fmt = fmt.lower()
+    if fmt == 'json':
+        fmt = 'jsonl' # One object per line is the only JSON flavour that can be streamed
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format '{fmt}'. Use one of: {', '.join(SUPPORTED_FORMATS)}.")
+    return fmt
+
+def iter_rows(file_obj, fmt):
+    """
+    Streams (row_number, row) pairs from an open file. `row` is a dict of book fields,
+    or an error message string when the line itself can't be parsed.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(file_obj)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(file_obj, 1):
+            if not line.strip():
+                continue # Tolerate blank lines, e.g. a trailing newline
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, "Expected a JSON object."
+                continue
+            yield line_number, row
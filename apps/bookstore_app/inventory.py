@@ -2,19 +2,35 @@
 
 import json
 import os
+import sys
+import threading
 # import math # This import is not used and can be removed
 from pathlib import Path
-from apps.bookstore_app.book import Book # Import the Book class
+from apps.bookstore_app.book import Book, book_key # Import the Book class
+from apps.bookstore_app.search_index import NGramIndex
+from apps.bookstore_app.sorted_index import SortedIndex
+from apps.bookstore_app.stock_ledger import StockLedger
+from apps.bookstore_app.inventory_stats import InventoryStats
+from apps.bookstore_app.persistence import CoalescingWriter
+from apps.bookstore_app.catalog_import import ImportReport, BOOK_FIELDS, detect_format, iter_rows
+from shared.render import DEFAULT_PAGE_SIZE, paint, render_page, render_rows, use_color
+from shared.append_log import AppendLog, file_digest
+from shared.utils import atomic_write_json
 from colorama import Fore, Style
 
 DATA_FILE = 'books.json' # File to store book inventory
+CHANGES_FILE = 'books.changes.jsonl' # Per-book changes appended since DATA_FILE was last written (JsonBackend)
 
-def save_books_to_file(books_list):
+def save_books_to_file(books_list, verbose=True, path=DATA_FILE):
     """Saves a list of Book objects to a JSON file."""
+    return _write_book_dicts([b.to_dict() for b in books_list], verbose, path)
+
+def _write_book_dicts(book_dicts, verbose=True, path=DATA_FILE):
+    """Atomically writes already-serialized books to the JSON file."""
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump([b.to_dict() for b in books_list], f, indent=4)
-        print(f"{Fore.GREEN}✓ Inventory saved successfully to '{DATA_FILE}'{Style.RESET_ALL}")
+        atomic_write_json(path, book_dicts)
+        if verbose:
+            print(f"{Fore.GREEN}✓ Inventory saved successfully to '{path}'{Style.RESET_ALL}")
         return True
     except IOError as e:
         print(f"{Fore.RED}✗ Error saving inventory: {e}{Style.RESET_ALL}")
@@ -23,22 +39,22 @@ def save_books_to_file(books_list):
         print(f"{Fore.RED}✗ An unexpected error occurred while saving: {e}{Style.RESET_ALL}")
         return False
 
-def load_books_from_file():
+def load_books_from_file(path=DATA_FILE):
     """Loads a list of Book objects from a JSON file."""
-    if not Path(DATA_FILE).exists():
-        print(f"{Fore.YELLOW}⚠ No inventory file '{DATA_FILE}' found. Starting with an empty inventory.{Style.RESET_ALL}")
+    if not Path(path).exists():
+        print(f"{Fore.YELLOW}⚠ No inventory file '{path}' found. Starting with an empty inventory.{Style.RESET_ALL}")
         return []
     
     try:
-        with open(DATA_FILE, 'r') as f:
+        with open(path, 'r') as f:
             data = json.load(f)
         
         # Convert dictionaries back into Book objects
         books = [Book.from_dict(b_data) for b_data in data]
-        print(f"{Fore.GREEN}✓ Loaded {len(books)} books from '{DATA_FILE}'{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}✓ Loaded {len(books)} books from '{path}'{Style.RESET_ALL}")
         return books
     except json.JSONDecodeError:
-        print(f"{Fore.RED}✗ Inventory file '{DATA_FILE}' is corrupted. Starting with an empty inventory.{Style.RESET_ALL}")
+        print(f"{Fore.RED}✗ Inventory file '{path}' is corrupted. Starting with an empty inventory.{Style.RESET_ALL}")
         return []
     except IOError as e:
         print(f"{Fore.RED}✗ Error loading inventory: {e}{Style.RESET_ALL}")
@@ -47,26 +63,342 @@ def load_books_from_file():
         print(f"{Fore.RED}✗ An unexpected error occurred while loading: {e}{Style.RESET_ALL}")
         return []
 
+def merge_near_duplicates(books):
+    """
+    Drops books whose title/author only differ from an earlier one's in case or spacing
+    (older files may hold such pairs), keeping the first and reporting each merge.
+    Returns (kept books, number merged).
+    """
+    kept = {}
+    for book in books:
+        first = kept.setdefault(book_key(book.title, book.author), book)
+        if first is not book:
+            print(f"{Fore.YELLOW}⚠ Merged '{book.title}' by {book.author} into '{first.title}' by {first.author} "
+                  f"(same title/author apart from case or spacing); keeping the first.{Style.RESET_ALL}")
+    return list(kept.values()), len(books) - len(kept)
+
+class JsonBackend:
+    """
+    Default storage backend: the catalog in `path` (books.json) plus `changes_path`
+    (books.changes.jsonl), an AppendLog with one line per changed or removed book. A flush
+    appends only the dirty records, so it costs O(changes) rather than a rewrite of the
+    catalog. Once the log is as long as the catalog (and at least `compact_min` lines) it
+    is folded back into the JSON file.
+    """
+
+    serves_queries = False # InventoryManager loads the whole catalog and answers queries itself
+
+    def __init__(self, path=DATA_FILE, changes_path=None, compact_min=1000):
+        self.path = path
+        self.changes_path = changes_path or f"{os.path.splitext(path)[0]}.changes.jsonl"
+        self._log = AppendLog(self.changes_path, path, compact_min)
+        self._merged = False # Near-duplicates were merged on load; the next flush rewrites the file
+
+    def load(self):
+        """
+        Loads the JSON file, then replays the change log on top of it. Near-duplicates are
+        merged, since the log identifies books by book_key and could not tell them apart.
+        """
+        books = load_books_from_file(self.path)
+        try:
+            books = self._replay(books)
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error reading inventory changes from '{self.changes_path}': {e}{Style.RESET_ALL}")
+        books, merged = merge_near_duplicates(books)
+        self._merged = merged > 0
+        return books
+
+    def _replay(self, books):
+        positions = {} # book_key -> index in `books`; near-duplicates keep the first, as the indexes do
+        for i, book in enumerate(books):
+            positions.setdefault(book_key(book.title, book.author), i)
+
+        def apply(change):
+            if "removed" in change:
+                i = positions.pop(tuple(change["removed"]), None)
+                if i is not None:
+                    books[i] = None
+            else:
+                book = Book.from_dict(change["book"])
+                key = book_key(book.title, book.author)
+                if key in positions:
+                    books[positions[key]] = book
+                else:
+                    positions[key] = len(books)
+                    books.append(book)
+
+        read = self._log.open(file_digest(self.path), len(books), apply)
+        if read is None:
+            return books
+        print(f"{Fore.GREEN}✓ Applied {read} logged changes from '{self.changes_path}'{Style.RESET_ALL}")
+        return [book for book in books if book is not None]
+
+    def save_all(self, books, verbose=True):
+        return self.write_snapshot([b.to_dict() for b in books], verbose)
+
+    def write_snapshot(self, book_dicts, verbose=True):
+        """Rewrites the JSON file with the whole catalog and starts an empty change log."""
+        if not _write_book_dicts(book_dicts, verbose, self.path):
+            return False
+        self._merged = False
+        try:
+            self._log.reset(file_digest(self.path), len(book_dicts))
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error resetting '{self.changes_path}': {e}{Style.RESET_ALL}")
+        return True
+
+    def write_changes(self, book_dicts, removed_keys, verbose=True):
+        """Appends the removed keys, then the changed books, to the log with a single fsync."""
+        # Removals go first so a key that was removed and then re-added ends up present
+        entries = [{"removed": list(key)} for key in removed_keys]
+        entries += [{"book": d} for d in book_dicts]
+        try:
+            self._log.append(entries)
+            if verbose:
+                print(f"{Fore.GREEN}✓ Inventory saved successfully to '{self.path}'{Style.RESET_ALL}")
+            return True
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error saving inventory: {e}{Style.RESET_ALL}")
+            return False
+
+    def should_compact(self):
+        """True once the log is as long as the snapshot, or when the file still holds
+        near-duplicates that were merged on load."""
+        return self._merged or self._log.should_compact()
+
+    def close(self):
+        self._log.close()
+
 class InventoryManager:
-    def __init__(self):
+    def __init__(self, coalesce_writes=False, flush_interval=2.0, flush_every=500, backend=None):
+        """
+        `backend` defaults to JsonBackend (books.json); pass a SqliteBackend for indexed row-level storage.
+        A backend that serves queries is not read at startup: lookups, searches and range queries
+        go to its indexes, and the whole catalog is only loaded once something needs every book
+        (viewing all books, the dashboard, an import or a full save).
+        With coalesce_writes=True, mutations only mark books dirty and a background thread
+        writes them out every `flush_every` changes or `flush_interval` seconds (or on commit()).
+        """
+        self._backend = backend if backend is not None else JsonBackend()
         self.books = []
+        self._books_by_key = {} # Normalized (title, author) -> Book, keeps duplicate checks O(1)
+        self._removed_keys = set() # Keys deleted or renamed away while the catalog isn't loaded
+        self._search_index = NGramIndex() # Trigram index behind find_books
+        self._price_index = SortedIndex(lambda b: b.price_cents) # Sorted indexes for range queries
+        self._stock_index = SortedIndex(lambda b: b.stock)
+        self.stats = InventoryStats(self._stock_index) # Running totals for the dashboard
+        self._lock = threading.RLock() # Guards books and indexes against the background flusher
+        self._write_lock = threading.Lock() # Orders backend writes; taken before _lock is released
+        self._writer = None
+        if coalesce_writes:
+            self._writer = CoalescingWriter(self._flush_changes, max_pending_ops=flush_every, max_delay=flush_interval)
+        # Created after the writer: exit hooks run in reverse, so the ledger's last batch reaches the writer before it closes
+        self.ledger = StockLedger(self) # Lock-striped stock changes for concurrent point-of-sale workers
         self._load_initial_data()
 
     def _load_initial_data(self):
         """Loads book data when the manager is initialized."""
-        self.books = load_books_from_file()
+        if self._backend.serves_queries:
+            self._open_cold()
+        else:
+            self.books = self._backend.load()
+            self._rebuild_indexes()
+
+    @property
+    def books(self):
+        """The whole catalog. With a query backend, the first access reads every book."""
+        if not self._loaded:
+            self._load_all()
+        return self._books
+
+    @books.setter
+    def books(self, books):
+        self._books = books
+        self._loaded = True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._books) if self._loaded else self._backend.count()
+
+    def _open_cold(self):
+        """Starts on a query backend without reading the catalog."""
+        self._books = []
+        self._loaded = False
+        self._removed_keys = set()
+        self._rebuild_indexes() # Empty; _books_by_key then only holds the books handed out so far
+        print(f"{Fore.GREEN}✓ Opened '{self._backend.path}' with {self._backend.count()} books{Style.RESET_ALL}")
+
+    def _load_all(self):
+        """
+        Reads the whole catalog from a query backend. Books already handed out stay the same
+        objects (with their unsaved changes), and unsaved deletes and renames are respected.
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            books = []
+            seen = set()
+            for stored in self._backend.load():
+                key = book_key(stored.title, stored.author)
+                current = self._books_by_key.get(key)
+                if current is not None:
+                    books.append(current)
+                    seen.add(key)
+                elif key not in self._removed_keys:
+                    books.append(stored)
+            books.extend(book for key, book in self._books_by_key.items() if key not in seen) # Not written yet
+            self.books = books
+            self._removed_keys = set()
+            self._rebuild_indexes()
+
+    def _adopt(self, book):
+        """Files a book read from a query backend, returning the copy already handed out if there is one."""
+        if book is None:
+            return None
+        return self._books_by_key.setdefault(book_key(book.title, book.author), book)
+
+    def _lookup(self, title, author):
+        """The book filed under this title/author, asking a query backend while the catalog isn't loaded. Caller holds the lock."""
+        key = book_key(title, author)
+        book = self._books_by_key.get(key)
+        if book is None and not self._loaded and key not in self._removed_keys:
+            book = self._adopt(self._backend.get(title, author))
+        return book
+
+    def _query(self, run):
+        """Runs a backend query once pending changes are written, so its indexes are current."""
+        self.commit()
+        with self._lock:
+            return [self._adopt(book) for book in run()]
+
+    def _rebuild_indexes(self):
+        """Rebuilds all lookup indexes from the current list of books."""
+        self._books_by_key = {}
+        self._search_index = NGramIndex()
+        for book in self._books:
+            # Backends merge near-duplicates on load; should one slip through, the first one wins
+            self._books_by_key.setdefault(book_key(book.title, book.author), book)
+            self._search_index.add(book)
+        self._price_index.rebuild(self._books)
+        self._stock_index.rebuild(self._books)
+        self.stats.reset(self._books)
+
+    def _index_book(self, book, key, sorted_indexes=True):
+        """Adds a new book to every index. Caller holds the lock. Bulk callers pass
+        sorted_indexes=False and rebuild the price and stock indexes once afterwards."""
+        self._books_by_key[key] = book
+        if not self._loaded:
+            self._removed_keys.discard(key)
+            return # The backend's indexes answer queries until the catalog is loaded
+        self._search_index.add(book)
+        if sorted_indexes:
+            self._price_index.add(book)
+            self._stock_index.add(book)
+        self.stats.add(book)
+
+    def _unindex_book(self, book, key):
+        """Removes a book from every index. Caller holds the lock."""
+        if self._books_by_key.get(key) is book:
+            del self._books_by_key[key]
+        if not self._loaded:
+            self._removed_keys.add(key) # Its row stays in the backend until the delete is written
+        self._search_index.remove(book)
+        self._price_index.remove(book)
+        self._stock_index.remove(book)
+        self.stats.remove(book)
+
+    def _rekey_book(self, book, old_key):
+        """Moves a book to its new keys in the indexes after its title or author changed."""
+        if self._books_by_key.get(old_key) is book:
+            del self._books_by_key[old_key]
+        new_key = book_key(book.title, book.author)
+        self._books_by_key[new_key] = book
+        if not self._loaded:
+            self._removed_keys.add(old_key)
+            self._removed_keys.discard(new_key)
+            return
+        self._search_index.refresh(book)
+
+    def _persist(self, book=None, removed_key=None):
+        """Persists one mutation: writes right away, or queues it for the next coalesced flush."""
+        if self._writer is None:
+            return self._flush_changes({book} - {None}, {removed_key} - {None}, verbose=True) # Save immediately
+        if book is not None:
+            self._writer.mark_dirty(book)
+        if removed_key is not None:
+            self._writer.mark_removed(removed_key)
+        return True
+
+    def _flush_changes(self, dirty_books, removed_keys, verbose=False):
+        """
+        Snapshots the changes under the lock, then hands them to the backend holding only the
+        write lock. That one is taken before _lock is released, so writes land in snapshot order.
+        """
+        with self._lock:
+            if self._backend.should_compact():
+                snapshot = [b.to_dict() for b in self.books] # The log is long enough to fold back in
+            else:
+                snapshot = None
+                # Skip books deleted after they were marked dirty, so they aren't written back
+                book_dicts = [b.to_dict() for b in dirty_books
+                              if self._books_by_key.get(book_key(b.title, b.author)) is b]
+            self._write_lock.acquire()
+        try:
+            if snapshot is not None:
+                return self._backend.write_snapshot(snapshot, verbose)
+            return self._backend.write_changes(book_dicts, removed_keys, verbose)
+        finally:
+            self._write_lock.release()
+
+    def _stock_changed(self, book):
+        """Called by the ledger after it changed a book's stock."""
+        with self._lock:
+            self._stock_index.refresh(book)
+            self.stats.refresh(book)
+
+    def _commit_stock_batch(self, books):
+        """Persists a batch of ledger adjustments with a single write."""
+        if self._writer is not None:
+            for book in books:
+                self._writer.mark_dirty(book)
+            return True
+        return self._flush_changes(books, set())
+
+    def commit(self):
+        """Writes any pending ledger adjustments and coalesced changes to disk now."""
+        ok = self.ledger.commit()
+        if self._writer is None:
+            return ok # Every other mutation was already saved
+        return self._writer.flush() and ok
+
+    def close(self):
+        """Stops the background flusher (if any) after writing pending changes, then closes the backend."""
+        ok = self.ledger.close()
+        if self._writer is not None:
+            ok = self._writer.close() and ok
+        self._backend.close()
+        return ok
+
+    def get_book(self, title, author):
+        """Returns the book with exactly this title and author (ignoring case/spacing), or None."""
+        with self._lock:
+            return self._lookup(title, author)
 
     def add_book(self, title, author, price, stock):
         """Adds a new book to the inventory."""
         try:
-            # Check for exact duplicate (title and author) to prevent accidental double-entry
-            if any(b.title.lower() == title.lower() and b.author.lower() == author.lower() for b in self.books):
-                raise ValueError(f"Book '{title}' by {author} already exists in inventory.")
-            
             new_book = Book(title, author, price, stock)
-            self.books.append(new_book)
+            key = book_key(new_book.title, new_book.author)
+            with self._lock:
+                # Check for exact duplicate (title and author) to prevent accidental double-entry
+                if self._lookup(title, author) is not None:
+                    raise ValueError(f"Book '{title}' by {author} already exists in inventory.")
+
+                if self._loaded:
+                    self._books.append(new_book)
+                self._index_book(new_book, key)
             print(f"{Fore.GREEN}✓ Book '{new_book.title}' added successfully.{Style.RESET_ALL}")
-            self.save_data() # Save immediately after adding
+            self._persist(new_book)
             return True
         except ValueError as e:
             print(f"{Fore.RED}✗ Failed to add book: {e}{Style.RESET_ALL}")
@@ -75,61 +407,186 @@ class InventoryManager:
             print(f"{Fore.RED}✗ An unexpected error occurred while adding book: {e}{Style.RESET_ALL}")
             return False
 
-    def view_all_books(self):
-        """Displays details of all books in the inventory."""
+    def import_books(self, source, fmt=None, encoding='utf-8'):
+        """
+        Bulk-imports books from a CSV or JSONL file (path or open file object).
+        Rows are streamed, validated like add_book, deduplicated against the catalog
+        and the batch itself, and the inventory is saved once at the end.
+        Returns an ImportReport.
+        """
+        fmt = detect_format(source, fmt)
+        report = ImportReport()
+        self.books # Every row is checked against the whole catalog, so load it first
+
+        if isinstance(source, (str, Path)):
+            with open(source, 'r', encoding=encoding, newline='') as f:
+                accepted = self._import_rows(iter_rows(f, fmt), report)
+        else:
+            accepted = self._import_rows(iter_rows(source, fmt), report)
+
+        if accepted:
+            self._flush_changes(accepted, set(), verbose=True) # One write for the whole batch
+        print(f"{Fore.GREEN}✓ Import finished: {report}{Style.RESET_ALL}")
+        return report
+
+    def _import_rows(self, rows, report):
+        """Validates and adds streamed rows, recording each outcome in the report. Returns the new books."""
+        accepted = []
+        for row_number, row in rows:
+            if isinstance(row, str): # The reader couldn't parse this line
+                report.reject(row_number, row)
+                continue
+            missing = [field for field in BOOK_FIELDS if row.get(field) is None]
+            if missing:
+                report.reject(row_number, f"Missing field(s): {', '.join(missing)}.")
+                continue
+            try:
+                # Book's constructor runs the same static validators as add_book
+                new_book = Book(row['title'], row['author'], row['price'], row['stock'])
+            except ValueError as e:
+                report.reject(row_number, str(e))
+                continue
+
+            key = book_key(new_book.title, new_book.author)
+            with self._lock:
+                # The key index already holds earlier rows of this batch, so in-file duplicates are caught too
+                if key in self._books_by_key:
+                    report.reject(row_number, f"Book '{new_book.title}' by {new_book.author} already exists in inventory.")
+                    continue
+                self.books.append(new_book)
+                self._index_book(new_book, key, sorted_indexes=False)
+            accepted.append(new_book)
+            report.accept()
+        if accepted:
+            with self._lock:
+                # One sort for the whole batch instead of a sorted insert per row
+                self._price_index.rebuild(self.books)
+                self._stock_index.rebuild(self.books)
+        return accepted
+
+    def view_all_books(self, page=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Displays the books in the inventory. With `page` (1-based) only that page is formatted
+        and written in one go; without it the whole list is streamed in buffered chunks.
+        Colors are skipped when stdout isn't a terminal. Returns the total number of pages.
+        """
         if not self.books:
             print(f"{Fore.YELLOW}No books in the inventory yet.{Style.RESET_ALL}")
-            return
-        
-        print(f"\n{Fore.CYAN}═══ Current Inventory ═══{Style.RESET_ALL}")
-        for i, book in enumerate(self.books, 1):
-            print(f"{i}. {book}")
-        print(f"{Fore.CYAN}═════════════════════════{Style.RESET_ALL}")
+            return 0
+
+        color = use_color()
+        total_pages = (len(self.books) + page_size - 1) // page_size
+        title = "═══ Current Inventory ═══"
+        if page is not None:
+            page = min(max(page, 1), total_pages)
+            title = f"═══ Current Inventory (page {page} of {total_pages}) ═══"
+
+        sys.stdout.write(f"\n{paint(title, Fore.CYAN, color=color)}\n")
+        if page is None:
+            render_rows(self.books, Book.format_line, color=color)
+        else:
+            render_page(self.books, Book.format_line, offset=(page - 1) * page_size, page_size=page_size, color=color)
+        sys.stdout.write(f"{paint('═' * len(title), Fore.CYAN, color=color)}\n")
+        return total_pages
+
+    def view_dashboard(self, top=5):
+        """
+        Displays inventory value, the best-stocked authors and the books closest to running out.
+        Like view_all_books, colors are skipped when stdout isn't a terminal.
+        """
+        self.books # The running totals cover the whole catalog
+        with self._lock:
+            total_value, total_units = self.stats.total_value, self.stats.total_units
+            top_authors = self.stats.top_authors(top)
+            running_out = self.stats.closest_to_running_out(top)
+
+        color = use_color()
+        lines = [f"\n{paint('═══ Inventory Dashboard ═══', Fore.CYAN, color=color)}",
+                 f"{paint('Total Value:', Fore.GREEN, color=color)} €{total_value:.2f} across {total_units} units",
+                 paint("Most stocked authors:", Fore.BLUE, color=color)]
+        lines += [f"  {author}: {units} units" for author, units in top_authors]
+        lines.append(paint("Closest to running out:", Fore.YELLOW, color=color))
+        sys.stdout.write("\n".join(lines) + "\n")
+        render_rows(running_out, Book.format_line, color=color)
+        sys.stdout.write(paint("═══════════════════════════", Fore.CYAN, color=color) + "\n")
 
     def find_books(self, search_term):
-    
+        """Finds books whose title or author contains the search term (case-insensitive)."""
+        if not self._loaded:
+            return self._query(lambda: self._backend.find(search_term))
         search_term_lower = search_term.strip().lower()
+        found_books = self._search_index.search(search_term_lower)
+        if found_books is not None:
+            return found_books
+
+        # Terms shorter than an n-gram can't use the index, so fall back to a scan
         found_books = [
             book for book in self.books 
             if search_term_lower in book.title.lower() or search_term_lower in book.author.lower()
         ]
         return found_books
 
+    def books_in_price_range(self, min_price, max_price, limit=None):
+        """Returns books priced from min_price to max_price (inclusive), cheapest first."""
+        if not self._loaded:
+            return self._query(lambda: self._backend.books_in_price_range(min_price, max_price, limit))
+        with self._lock:
+            return self._price_index.between(round(min_price * 100), round(max_price * 100), limit)
+
+    def low_stock(self, threshold, limit=None):
+        """Returns books with fewer than `threshold` units in stock, lowest stock first."""
+        if not self._loaded:
+            return self._query(lambda: self._backend.low_stock(threshold, limit))
+        with self._lock:
+            return self._stock_index.below(threshold, limit)
+
     def update_book(self, book_to_update, new_title=None, new_author=None, new_price=None, new_stock=None):
    
         updated = False
         try:
-            if new_title is not None and new_title.strip():
-                # Prevent changing title to an existing one (title+author unique)
-                # Ensure we don't compare against itself when checking for duplicates
-                if new_title.lower() != book_to_update.title.lower() and \
-                   any(b.title.lower() == new_title.lower() and b.author.lower() == book_to_update.author.lower() 
-                       for b in self.books if b is not book_to_update): # Use 'is not' for object identity
-                    print(f"{Fore.RED}✗ A book with title '{new_title}' by {book_to_update.author} already exists. Title not updated.{Style.RESET_ALL}")
-                else:
-                    book_to_update.title = Book._validate_string_input(new_title, "Title")
-                    updated = True
-            
-            if new_author is not None and new_author.strip():
-                # Prevent changing author to an existing one (title+author unique)
-                if new_author.lower() != book_to_update.author.lower() and \
-                   any(b.title.lower() == book_to_update.title.lower() and b.author.lower() == new_author.lower()
-                       for b in self.books if b is not book_to_update): # Use 'is not' for object identity
-                    print(f"{Fore.RED}✗ A book with title '{book_to_update.title}' by '{new_author}' already exists. Author not updated.{Style.RESET_ALL}")
-                else:
-                    book_to_update.author = Book._validate_string_input(new_author, "Author")
-                    updated = True
+            with self._lock:
+                original_key = book_key(book_to_update.title, book_to_update.author)
+                if new_title is not None and new_title.strip():
+                    # Prevent changing title to an existing one (title+author unique)
+                    # Ensure we don't compare against itself when checking for duplicates
+                    existing = self._lookup(new_title, book_to_update.author)
+                    if existing is not None and existing is not book_to_update: # Use 'is not' for object identity
+                        print(f"{Fore.RED}✗ A book with title '{new_title}' by {book_to_update.author} already exists. Title not updated.{Style.RESET_ALL}")
+                    else:
+                        old_key = book_key(book_to_update.title, book_to_update.author)
+                        book_to_update.title = Book._validate_string_input(new_title, "Title")
+                        self._rekey_book(book_to_update, old_key)
+                        updated = True
             
-            if new_price is not None:
-                book_to_update.price = Book._validate_price(new_price)
-                updated = True
+                if new_author is not None and new_author.strip():
+                    # Prevent changing author to an existing one (title+author unique)
+                    existing = self._lookup(book_to_update.title, new_author)
+                    if existing is not None and existing is not book_to_update: # Use 'is not' for object identity
+                        print(f"{Fore.RED}✗ A book with title '{book_to_update.title}' by '{new_author}' already exists. Author not updated.{Style.RESET_ALL}")
+                    else:
+                        old_key = book_key(book_to_update.title, book_to_update.author)
+                        book_to_update.author = Book._validate_string_input(new_author, "Author")
+                        self._rekey_book(book_to_update, old_key)
+                        updated = True
             
-            if new_stock is not None:
-                book_to_update.stock = Book._validate_stock(new_stock)
-                updated = True
+                if new_price is not None:
+                    book_to_update.price = Book._validate_price(new_price)
+                    self._price_index.refresh(book_to_update)
+                    updated = True
             
+                if new_stock is not None:
+                    with self.ledger.lock_for(book_to_update): # Don't race with concurrent sales
+                        book_to_update.stock = Book._validate_stock(new_stock)
+                    self._stock_index.refresh(book_to_update)
+                    updated = True
+
+                if updated:
+                    self.stats.refresh(book_to_update) # Author, price and stock may all have changed
+
             if updated:
-                self.save_data()
+                # A rename moves the record to a new key, so the old one counts as removed
+                renamed = book_key(book_to_update.title, book_to_update.author) != original_key
+                self._persist(book_to_update, removed_key=original_key if renamed else None)
                 print(f"{Fore.GREEN}✓ Book '{book_to_update.title}' updated successfully.{Style.RESET_ALL}")
             else:
                 print(f"{Fore.YELLOW}No changes applied to '{book_to_update.title}'.{Style.RESET_ALL}")
@@ -143,21 +600,29 @@ class InventoryManager:
 
     def delete_book(self, book_to_delete):
       
-        if book_to_delete in self.books:
-            self.books.remove(book_to_delete)
-            self.save_data()
-            print(f"{Fore.GREEN}✓ Book '{book_to_delete.title}' by {book_to_delete.author} deleted successfully.{Style.RESET_ALL}")
-            return True
-        else:
-            print(f"{Fore.RED}✗ Book not found in inventory. Deletion failed.{Style.RESET_ALL}")
-            return False
+        with self._lock:
+            key = book_key(book_to_delete.title, book_to_delete.author)
+            # Without the catalog loaded, only books handed out by this manager can be deleted
+            known = book_to_delete in self._books if self._loaded else self._books_by_key.get(key) is book_to_delete
+            if not known:
+                print(f"{Fore.RED}✗ Book not found in inventory. Deletion failed.{Style.RESET_ALL}")
+                return False
+            if self._loaded:
+                self._books.remove(book_to_delete)
+            self._unindex_book(book_to_delete, key)
+        self._persist(removed_key=key)
+        print(f"{Fore.GREEN}✓ Book '{book_to_delete.title}' by {book_to_delete.author} deleted successfully.{Style.RESET_ALL}")
+        return True
 
     def adjust_stock(self, book_to_adjust, quantity_change):
        
         try:
-            new_stock = book_to_adjust.stock + quantity_change
-            book_to_adjust.stock = Book._validate_stock(new_stock) # Re-use validation for non-negative
-            self.save_data()
+            with self._lock, self.ledger.lock_for(book_to_adjust): # Don't race with concurrent sales
+                new_stock = book_to_adjust.stock + quantity_change
+                book_to_adjust.stock = Book._validate_stock(new_stock) # Re-use validation for non-negative
+                self._stock_index.refresh(book_to_adjust)
+                self.stats.refresh(book_to_adjust)
+            self._persist(book_to_adjust)
             print(f"{Fore.GREEN}✓ Stock for '{book_to_adjust.title}' adjusted. New stock: {book_to_adjust.stock}{Style.RESET_ALL}")
             return True
         except ValueError as e:
@@ -169,10 +634,20 @@ class InventoryManager:
 
     def save_data(self):
         """Wrapper to save all books to file."""
-        return save_books_to_file(self.books)
+        if not self._loaded:
+            return self.commit() # Every change is already stored row by row; write what's pending
+        with self._lock, self._write_lock:
+            return self._backend.save_all(self.books)
 
     def load_data(self):
         """Wrapper to load all books from file."""
-        self.books = load_books_from_file()
-        # load_books_from_file already handles errors and returns [], so no need for 'is not None'
-        return True
\ No newline at end of file
+        if self._writer is not None:
+            self._writer.discard_pending() # Pending changes belong to the catalog being replaced
+        with self._lock:
+            if self._backend.serves_queries:
+                self._open_cold()
+            else:
+                self.books = self._backend.load()
+                self._rebuild_indexes()
+        # Backends already handle load errors and return [], so no need for 'is not None'
+        return True
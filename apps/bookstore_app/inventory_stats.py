@@ -0,0 +1,72 @@
+# apps/bookstore_app/inventory_stats.py
+
+import heapq
+
+class InventoryStats:
+    """
+    Running inventory aggregates (total value, units, per-author stock) updated with
+    O(1) deltas on every change, so dashboards never have to walk the whole catalog.
+    """
+
+    def __init__(self, stock_index):
+        # "Closest to running out" is served by the manager's sorted stock index (O(k))
+        self._stock_index = stock_index
+        self.total_value_cents = 0 # Σ price × stock, in cents to avoid float drift
+        self.total_units = 0
+        self._author_stock = {}    # author -> units in stock across their books
+        self._accounted = {}       # book -> (author, price_cents, stock) currently counted
+
+    def reset(self, books):
+        """Recomputes everything from scratch (used after loading a catalog)."""
+        self.total_value_cents = 0
+        self.total_units = 0
+        self._author_stock = {}
+        self._accounted = {}
+        for book in books:
+            self.add(book)
+
+    def add(self, book):
+        self._apply(book.author, book.price_cents, book.stock, +1)
+        self._accounted[book] = (book.author, book.price_cents, book.stock)
+
+    def remove(self, book):
+        counted = self._accounted.pop(book, None)
+        if counted is not None:
+            self._apply(*counted, -1)
+
+    def refresh(self, book):
+        """Swaps a book's old contribution for its current one after it changed."""
+        counted = self._accounted.get(book)
+        if counted is None:
+            return # Not tracked (e.g. already deleted)
+        current = (book.author, book.price_cents, book.stock)
+        if counted != current:
+            self._apply(*counted, -1)
+            self._apply(*current, +1)
+            self._accounted[book] = current
+
+    def _apply(self, author, price_cents, stock, sign):
+        self.total_value_cents += sign * price_cents * stock
+        self.total_units += sign * stock
+        units = self._author_stock.get(author, 0) + sign * stock
+        if units:
+            self._author_stock[author] = units
+        else:
+            self._author_stock.pop(author, None) # Authors with nothing in stock drop out of the map
+
+    @property
+    def total_value(self):
+        """Total inventory value in euros."""
+        return self.total_value_cents / 100
+
+    def author_stock(self, author):
+        """Units in stock for one author."""
+        return self._author_stock.get(author, 0)
+
+    def top_authors(self, k=5):
+        """The k authors with the most units in stock, as (author, units) pairs."""
+        return heapq.nlargest(k, self._author_stock.items(), key=lambda item: item[1])
+
+    def closest_to_running_out(self, k=5):
+        """The k books with the lowest stock."""
+        return self._stock_index.smallest(k)
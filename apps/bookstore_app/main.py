@@ -8,6 +8,7 @@ sys.path.insert(0, project_root)
 
 try:
     from shared.utils import setup_app_colors, get_valid_input
+    from shared.render import render_rows
     from apps.bookstore_app.book import Book
     from apps.bookstore_app.inventory import InventoryManager
 except ImportError as e:
@@ -28,7 +29,8 @@ def display_main_menu():
     print(f"{Fore.BLUE}5.{Style.RESET_ALL} Delete Book") 
     print(f"{Fore.BLUE}6.{Style.RESET_ALL} Save Inventory")
     print(f"{Fore.BLUE}7.{Style.RESET_ALL} Load Inventory")
-    print(f"{Fore.BLUE}8.{Style.RESET_ALL} Back to Main Menu")
+    print(f"{Fore.BLUE}8.{Style.RESET_ALL} Inventory Dashboard")
+    print(f"{Fore.BLUE}9.{Style.RESET_ALL} Back to Main Menu")
     print(f"{Fore.CYAN}═══════════════════════════════════════════════════════{Style.RESET_ALL}")
 
 def _select_book_from_results(found_books):
@@ -41,8 +43,7 @@ def _select_book_from_results(found_books):
         return None
 
     print(f"\n{Fore.CYAN}--- Found Books ---{Style.RESET_ALL}")
-    for i, book in enumerate(found_books, 1):
-        print(f"{Fore.BLUE}{i}.{Style.RESET_ALL} {book}")
+    render_rows(found_books, Book.format_line, number_codes=(Fore.BLUE,))
     print(f"-------------------")
 
     while True:
@@ -74,8 +75,20 @@ def handle_search_books(manager):
         print(f"{Fore.YELLOW}No books found matching '{search_term}'.{Style.RESET_ALL}")
     else:
         print(f"\n{Fore.GREEN}Found {len(found_books)} book(s) matching '{search_term}':{Style.RESET_ALL}")
-        for i, book in enumerate(found_books, 1):
-            print(f" {i}. {book}")
+        render_rows(found_books, Book.format_line)
+
+
+def handle_view_books(manager):
+    """Shows the inventory one page at a time."""
+    page = 1
+    while True:
+        total_pages = manager.view_all_books(page=page)
+        if page >= total_pages:
+            return
+        next_page = get_valid_input(f"Press Enter for page {page + 1} of {total_pages}", allow_empty=True)
+        if next_page is None:
+            return # User cancelled
+        page += 1
 
 
 def handle_update_book(manager):
@@ -151,10 +164,10 @@ def run_bookstore_app():
     while True:
         display_main_menu()
         
-        choice = get_valid_input("Enter your choice (1-8):", 
-                                 validator=lambda x: x if x in ['1','2','3','4','5','6','7','8'] 
-                                 else (_ for _ in ()).throw(ValueError("Invalid choice. Please enter a number between 1 and 8.")),
-                                 error_message=f"{Fore.RED}Invalid choice. Please enter a number between 1 and 8.{Style.RESET_ALL}")
+        choice = get_valid_input("Enter your choice (1-9):", 
+                                 validator=lambda x: x if x in ['1','2','3','4','5','6','7','8','9'] 
+                                 else (_ for _ in ()).throw(ValueError("Invalid choice. Please enter a number between 1 and 9.")),
+                                 error_message=f"{Fore.RED}Invalid choice. Please enter a number between 1 and 9.{Style.RESET_ALL}")
         
         if choice is None: # User cancelled menu input
             continue 
@@ -187,7 +200,7 @@ def run_bookstore_app():
             manager.add_book(title, author, price, stock)
         
         elif choice == '2': # View All Books
-            manager.view_all_books()
+            handle_view_books(manager)
         
         elif choice == '3': # Search Books
             handle_search_books(manager)
@@ -202,7 +215,7 @@ def run_bookstore_app():
             manager.save_data()
         
         elif choice == '7': # Load Inventory
-            if manager.books: # Only ask if there's data in memory
+            if len(manager): # Only ask if there's data to overwrite
                 confirm = get_valid_input(
                     f"{Fore.YELLOW}Warning: Loading new data will overwrite current unsaved changes. Proceed? (yes/no):{Style.RESET_ALL} ",
                     validator=lambda x: x.lower() if x.lower() in ['yes', 'no'] else (_ for _ in ()).throw(ValueError("Invalid input. Please enter 'yes' or 'no'.")),
@@ -213,7 +226,10 @@ def run_bookstore_app():
             
             manager.load_data() 
         
-        elif choice == '8': # Back to Main Menu
+        elif choice == '8': # Inventory Dashboard
+            manager.view_dashboard()
+
+        elif choice == '9': # Back to Main Menu
             # Optionally, ask to save before returning to main app menu if changes exist
             print(f"{Fore.BLUE}Returning to main application menu.{Style.RESET_ALL}")
             break
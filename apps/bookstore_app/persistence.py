@@ -0,0 +1,119 @@
+# apps/bookstore_app/persistence.py
+
+import atexit
+import threading
+import time
+
+class CoalescingWriter:
+    """
+    Collects dirty records and flushes them in batches on a background thread.
+    A flush happens once `max_pending_ops` mutations have piled up, once the oldest
+    pending mutation is `max_delay` seconds old, or when flush() is called explicitly.
+    """
+
+    def __init__(self, flush_func, max_pending_ops=500, max_delay=2.0):
+        self._flush_func = flush_func # Called as flush_func(dirty_records, removed_keys) -> bool
+        self.max_pending_ops = max_pending_ops
+        self.max_delay = max_delay
+
+        self._dirty = set()   # Records changed since the last flush (one flag per record)
+        self._removed = set() # Keys of records deleted since the last flush
+        self._pending_ops = 0
+        self._oldest_pending = None # time.monotonic() of the first unflushed mutation
+
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock() # Keeps background and explicit flushes in order
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="coalescing-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close) # Don't lose pending changes when the interpreter exits
+
+    @property
+    def pending_ops(self):
+        return self._pending_ops
+
+    def mark_dirty(self, record):
+        """Flags a record as changed."""
+        with self._cond:
+            self._dirty.add(record)
+            self._note_op()
+
+    def mark_removed(self, key):
+        """Records that the record stored under `key` was deleted."""
+        with self._cond:
+            self._removed.add(key)
+            self._note_op()
+
+    def _note_op(self):
+        # Caller holds self._cond
+        self._pending_ops += 1
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        if self._pending_ops == 1 or self._pending_ops >= self.max_pending_ops:
+            self._cond.notify()
+
+    def _take_pending(self):
+        """Swaps out the pending changes so new mutations can keep accumulating."""
+        with self._cond:
+            dirty, removed = self._dirty, self._removed
+            self._dirty, self._removed = set(), set()
+            self._pending_ops = 0
+            self._oldest_pending = None
+            return dirty, removed
+
+    def _restore_pending(self, dirty, removed):
+        """Puts changes back after a failed flush so the next attempt retries them."""
+        with self._cond:
+            self._dirty |= dirty
+            self._removed |= removed
+            self._pending_ops += len(dirty) + len(removed)
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+
+    def flush(self):
+        """Writes all pending changes now. Returns True on success (or if nothing was pending)."""
+        with self._flush_lock:
+            dirty, removed = self._take_pending()
+            if not dirty and not removed:
+                return True
+            ok = False
+            try:
+                ok = self._flush_func(dirty, removed)
+            finally:
+                if not ok:
+                    self._restore_pending(dirty, removed)
+            return ok
+
+    def discard_pending(self):
+        """Drops pending changes without writing them (e.g. after reloading from disk)."""
+        with self._flush_lock:
+            self._take_pending()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending_ops == 0:
+                        self._cond.wait()
+                        continue
+                    remaining = self._oldest_pending + self.max_delay - time.monotonic()
+                    if self._pending_ops >= self.max_pending_ops or remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(self.max_delay) # Changes were restored; back off before retrying
+
+    def close(self):
+        """Stops the background thread and flushes whatever is still pending."""
+        with self._cond:
+            if self._closed:
+                return True
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        atexit.unregister(self.close)
+        return self.flush()
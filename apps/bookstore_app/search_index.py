@@ -0,0 +1,82 @@
+# apps/bookstore_app/search_index.py
+
+GRAM_SIZE = 3 # Trigrams: short enough for partial words, selective enough to prune candidates
+
+def _grams(text):
+    """Returns the set of character n-grams in an (already lowercased) string."""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+class NGramIndex:
+    """Inverted n-gram index over book titles and authors for fast substring search."""
+
+    def __init__(self):
+        self._postings = {} # n-gram -> set of books whose title or author contains it
+        self._fields = {}   # book -> (title, author) lowercased exactly as they were indexed
+        self._order = {}    # book -> insertion sequence, so results keep catalog order
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._fields)
+
+    def add(self, book, seq=None):
+        """Indexes a book's title and author."""
+        title, author = book.title.lower(), book.author.lower()
+        self._fields[book] = (title, author)
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        self._order[book] = seq
+        postings = self._postings
+        for gram in _grams(title) | _grams(author):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {book}
+            else:
+                posting.add(book)
+
+    def remove(self, book):
+        """Drops a book from the index (safe to call after its fields were changed)."""
+        fields = self._fields.pop(book, None)
+        if fields is None:
+            return
+        del self._order[book]
+        for gram in _grams(fields[0]) | _grams(fields[1]):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(book)
+                if not posting:
+                    del self._postings[gram]
+
+    def refresh(self, book):
+        """Re-indexes a book after its title or author changed, keeping its position."""
+        seq = self._order.get(book)
+        self.remove(book)
+        self.add(book, seq)
+
+    def search(self, term):
+        """
+        Returns books whose lowercased title or author contains `term` (already lowercased),
+        in insertion order. Returns None when the term is too short to use the index.
+        """
+        if len(term) < GRAM_SIZE:
+            return None
+
+        postings = []
+        for gram in _grams(term):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return [] # A missing n-gram means nothing can match
+            postings.append(posting)
+
+        postings.sort(key=len) # Start from the rarest n-gram so intersections stay small
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if len(candidates) <= 32:
+                break # Cheaper to verify a handful of candidates than to keep intersecting
+            candidates = candidates.intersection(posting)
+
+        # n-grams can match out of order or across title/author, so verify each candidate
+        fields = self._fields
+        matches = [b for b in candidates if term in fields[b][0] or term in fields[b][1]]
+        matches.sort(key=self._order.__getitem__)
+        return matches
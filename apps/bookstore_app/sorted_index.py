@@ -0,0 +1,100 @@
+# apps/bookstore_app/sorted_index.py
+
+import bisect
+
+_AFTER_ALL = float('inf') # Sorts after every sequence number, for inclusive upper bounds
+_BUCKET_SIZE = 512        # Target bucket length; a bucket is split once it doubles
+
+class SortedIndex:
+    """
+    Keeps books ordered by one numeric attribute (e.g. price or stock) so range and
+    top-k queries cost O(log N + k) instead of a full scan. Ties keep insertion order.
+
+    Entries are (value, seq, book) tuples held in short sorted buckets, so adding or
+    removing one shifts at most a bucket's worth of entries instead of the whole list.
+    (value, seq) is unique, so tuple comparison never reaches the book.
+    """
+
+    def __init__(self, key_func):
+        self._key_func = key_func
+        self._buckets = []  # Sorted lists of (value, seq, book), in order
+        self._maxes = []    # (value, seq) of the last entry in each bucket
+        self._filed = {}    # book -> (value, seq) it is currently filed under
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._filed)
+
+    def rebuild(self, books):
+        """Indexes a whole catalog at once with a single sort."""
+        entries = sorted((self._key_func(b), seq, b) for seq, b in enumerate(books))
+        self._buckets = [entries[i:i + _BUCKET_SIZE] for i in range(0, len(entries), _BUCKET_SIZE)]
+        self._maxes = [bucket[-1][:2] for bucket in self._buckets]
+        self._filed = {book: (value, seq) for value, seq, book in entries}
+        self._next_seq = len(books)
+
+    def add(self, book, seq=None):
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        entry = (self._key_func(book), seq)
+        self._filed[book] = entry
+        if not self._buckets:
+            self._buckets.append([entry + (book,)])
+            self._maxes.append(entry)
+            return
+        b = min(bisect.bisect_left(self._maxes, entry), len(self._buckets) - 1)
+        bucket = self._buckets[b]
+        bisect.insort(bucket, entry + (book,))
+        self._maxes[b] = bucket[-1][:2]
+        if len(bucket) > 2 * _BUCKET_SIZE:
+            self._buckets[b:b + 1] = [bucket[:_BUCKET_SIZE], bucket[_BUCKET_SIZE:]]
+            self._maxes[b:b + 1] = [bucket[_BUCKET_SIZE - 1][:2], bucket[-1][:2]]
+
+    def remove(self, book):
+        """Drops a book, using the value it was filed under (so it works after the attribute changed)."""
+        entry = self._filed.pop(book, None)
+        if entry is None:
+            return None
+        b = bisect.bisect_left(self._maxes, entry)
+        bucket = self._buckets[b]
+        del bucket[bisect.bisect_left(bucket, entry)] # (value, seq) sorts just before (value, seq, book)
+        if bucket:
+            self._maxes[b] = bucket[-1][:2]
+        else:
+            del self._buckets[b]
+            del self._maxes[b]
+        return entry
+
+    def refresh(self, book):
+        """Re-files a book after its value changed (books not in the index are ignored)."""
+        entry = self._filed.get(book)
+        if entry is None or entry[0] == self._key_func(book):
+            return # Not indexed (e.g. already deleted), or still in the right place
+        self.remove(book)
+        self.add(book, entry[1])
+
+    def _books_from(self, start, stop, limit):
+        """Books of the entries from `start` (inclusive) up to `stop` (exclusive, None for the end), in order."""
+        result = []
+        b = bisect.bisect_left(self._maxes, start)
+        i = bisect.bisect_left(self._buckets[b], start) if b < len(self._buckets) else 0
+        while b < len(self._buckets):
+            for value, seq, book in self._buckets[b][i:]:
+                if (limit is not None and len(result) >= limit) or (stop is not None and (value, seq) >= stop):
+                    return result
+                result.append(book)
+            b, i = b + 1, 0
+        return result
+
+    def between(self, low, high, limit=None):
+        """Books with low <= value <= high, in ascending order (at most `limit` of them)."""
+        return self._books_from((low,), (high, _AFTER_ALL), limit)
+
+    def below(self, threshold, limit=None):
+        """Books with value < threshold, in ascending order (at most `limit` of them)."""
+        return self._books_from((), (threshold,), limit)
+
+    def smallest(self, k):
+        """The k books with the lowest values."""
+        return self._books_from((), None, max(k, 0))
@@ -0,0 +1,222 @@
+# apps/bookstore_app/sqlite_backend.py
+
+import sqlite3
+import sys
+import threading
+from os.path import dirname, join, abspath
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running the migration straight from this folder too
+    sys.path.insert(0, abspath(join(dirname(dirname(dirname(__file__))))))
+
+from apps.bookstore_app.book import Book, book_key
+from apps.bookstore_app.inventory import JsonBackend
+from colorama import Fore, Style
+
+DB_FILE = 'books.db' # Default SQLite database for the inventory
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id          INTEGER PRIMARY KEY,
+    title       TEXT NOT NULL,
+    author      TEXT NOT NULL,
+    norm_title  TEXT NOT NULL,  -- book_key() form, for exact/duplicate lookups
+    norm_author TEXT NOT NULL,
+    title_lower TEXT NOT NULL,  -- str.lower() form, matching find_books' substring semantics
+    author_lower TEXT NOT NULL,
+    price_cents INTEGER NOT NULL,
+    stock       INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS books_key_idx ON books (norm_title, norm_author);
+CREATE INDEX IF NOT EXISTS books_price_idx ON books (price_cents);
+CREATE INDEX IF NOT EXISTS books_stock_idx ON books (stock);
+"""
+
+# Trigram full-text index over the lower-cased title/author, so substring search doesn't scan
+# every row. Kept in sync by triggers; needs SQLite's FTS5 module (3.34+ for the trigram tokenizer).
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    title_lower, author_lower, content='books', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, title_lower, author_lower) VALUES (new.id, new.title_lower, new.author_lower);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title_lower, author_lower) VALUES ('delete', old.id, old.title_lower, old.author_lower);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title_lower, author_lower) VALUES ('delete', old.id, old.title_lower, old.author_lower);
+    INSERT INTO books_fts (rowid, title_lower, author_lower) VALUES (new.id, new.title_lower, new.author_lower);
+END;
+"""
+
+_TRIGRAM = 3 # Search terms shorter than this can't use the trigram index
+
+_UPSERT = """
+INSERT INTO books (title, author, norm_title, norm_author, title_lower, author_lower, price_cents, stock)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (norm_title, norm_author) DO UPDATE SET
+    title = excluded.title, author = excluded.author,
+    title_lower = excluded.title_lower, author_lower = excluded.author_lower,
+    price_cents = excluded.price_cents, stock = excluded.stock
+"""
+
+_COLUMNS = "title, author, price_cents, stock"
+
+def _row_params(book_dict):
+    """Turns a Book.to_dict() into the parameters for _UPSERT."""
+    title, author = book_dict["title"], book_dict["author"]
+    norm_title, norm_author = book_key(title, author)
+    return (title, author, norm_title, norm_author, title.lower(), author.lower(),
+            round(book_dict["price"] * 100), book_dict["stock"])
+
+def _row_to_book(row):
+    title, author, price_cents, stock = row
+    return Book(title, author, price_cents / 100, stock)
+
+class SqliteBackend:
+    """
+    Inventory storage in an SQLite database (WAL mode). Each mutation becomes a single
+    indexed statement instead of a rewrite of the whole catalog.
+
+    InventoryManager doesn't load() it at startup: get_book, find_books, books_in_price_range
+    and low_stock go to the direct queries below, which only read the matching rows through
+    the database's indexes. The catalog is read in full only when a caller needs every book.
+    """
+
+    serves_queries = True
+
+    def __init__(self, path=DB_FILE):
+        self.path = str(path)
+        # The coalescing flusher writes from its own thread, so share one connection behind a lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL") # Safe with WAL; fsyncs at checkpoints
+            self._conn.executescript(_SCHEMA)
+            self._fts = self._create_fts()
+
+    def _create_fts(self):
+        """Creates the full-text index (filling it for databases made before it existed). Caller holds the lock."""
+        try:
+            exists = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'books_fts'").fetchone()
+            with self._conn:
+                self._conn.executescript(_FTS_SCHEMA)
+                if not exists:
+                    self._conn.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError:
+            return False # No FTS5/trigram support in this SQLite build; find() scans instead
+
+    def load(self):
+        """Loads every book, in insertion order (rows are streamed, not fetched into a list first)."""
+        try:
+            with self._lock:
+                books = [_row_to_book(row) for row in self._conn.execute(f"SELECT {_COLUMNS} FROM books ORDER BY id")]
+            print(f"{Fore.GREEN}✓ Loaded {len(books)} books from '{self.path}'{Style.RESET_ALL}")
+            return books
+        except sqlite3.Error as e:
+            print(f"{Fore.RED}✗ Error loading inventory: {e}{Style.RESET_ALL}")
+            return []
+        except ValueError as e: # A row that fails Book's validation (e.g. negative stock)
+            print(f"{Fore.RED}✗ Inventory database '{self.path}' holds an invalid book: {e} Starting with an empty inventory.{Style.RESET_ALL}")
+            return []
+
+    def save_all(self, books, verbose=True):
+        """Replaces the stored catalog with `books` in one transaction."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM books")
+                self._conn.executemany(_UPSERT, (_row_params(b.to_dict()) for b in books))
+            if verbose:
+                print(f"{Fore.GREEN}✓ Inventory saved successfully to '{self.path}'{Style.RESET_ALL}")
+            return True
+        except sqlite3.Error as e:
+            print(f"{Fore.RED}✗ Error saving inventory: {e}{Style.RESET_ALL}")
+            return False
+
+    def write_changes(self, book_dicts, removed_keys, verbose=True):
+        """Deletes the removed (title, author) keys, then upserts the changed books, atomically."""
+        try:
+            with self._lock, self._conn:
+                # Deletes go first so a key that was removed and then re-added ends up present
+                self._conn.executemany("DELETE FROM books WHERE norm_title = ? AND norm_author = ?", removed_keys)
+                self._conn.executemany(_UPSERT, (_row_params(d) for d in book_dicts))
+            if verbose:
+                print(f"{Fore.GREEN}✓ Inventory saved successfully to '{self.path}'{Style.RESET_ALL}")
+            return True
+        except sqlite3.Error as e:
+            print(f"{Fore.RED}✗ Error saving inventory: {e}{Style.RESET_ALL}")
+            return False
+
+    def should_compact(self):
+        return False # Rows are updated in place; there is no log to fold back
+
+    def _query(self, where, params, suffix="", limit=None):
+        if limit is not None:
+            suffix, params = f"{suffix} LIMIT ?", (*params, max(limit, 0))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLUMNS} FROM books WHERE {where} {suffix}", params).fetchall()
+        return [_row_to_book(row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    # --- Direct queries (these build fresh Book objects straight from the database) ---
+
+    def get(self, title, author):
+        """Exact (normalized) title/author lookup through the unique key index."""
+        books = self._query("norm_title = ? AND norm_author = ?", book_key(title, author))
+        return books[0] if books else None
+
+    def find(self, search_term):
+        """Same substring semantics as InventoryManager.find_books, narrowed down by the trigram index."""
+        term = search_term.strip().lower()
+        where = "(instr(title_lower, ?) > 0 OR instr(author_lower, ?) > 0)"
+        if not self._fts or len(term) < _TRIGRAM:
+            return self._query(where, (term, term), "ORDER BY id")
+        phrase = '"' + term.replace('"', '""') + '"' # Quoted, so the term is matched literally
+        # The index finds candidate rows; instr() keeps the exact str.lower() semantics
+        return self._query(f"id IN (SELECT rowid FROM books_fts WHERE books_fts MATCH ?) AND {where}",
+                           (phrase, term, term), "ORDER BY id")
+
+    def books_in_price_range(self, min_price, max_price, limit=None):
+        """Books priced between min_price and max_price (inclusive), cheapest first."""
+        return self._query("price_cents BETWEEN ? AND ?", (round(min_price * 100), round(max_price * 100)),
+                           "ORDER BY price_cents, id", limit)
+
+    def low_stock(self, threshold, limit=None):
+        """Books with fewer than `threshold` units in stock, lowest stock first."""
+        return self._query("stock < ?", (threshold,), "ORDER BY stock, id", limit)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def migrate_json_to_sqlite(json_path='books.json', db_path=DB_FILE):
+    """
+    One-shot copy of a books.json inventory (and its change log) into an SQLite database.
+    Books whose title/author only differ in case or spacing are merged by JsonBackend.load()
+    (the first one is kept and each merge is reported), so they fit the unique key.
+    Returns the number of books written.
+    """
+    books = JsonBackend(json_path).load()
+    backend = SqliteBackend(db_path)
+    try:
+        if not backend.save_all(books, verbose=False):
+            raise RuntimeError(f"Could not write to '{db_path}'.")
+    finally:
+        backend.close()
+    return len(books)
+
+if __name__ == "__main__":
+    # Usage: python -m apps.bookstore_app.sqlite_backend [books.json] [books.db]
+    json_path = sys.argv[1] if len(sys.argv) > 1 else 'books.json'
+    db_path = sys.argv[2] if len(sys.argv) > 2 else DB_FILE
+    if not Path(json_path).exists():
+        print(f"{Fore.RED}✗ No inventory file '{json_path}' to migrate.{Style.RESET_ALL}")
+        sys.exit(1)
+    count = migrate_json_to_sqlite(json_path, db_path)
+    print(f"{Fore.GREEN}✓ Migrated {count} books from '{json_path}' to '{db_path}'{Style.RESET_ALL}")
@@ -0,0 +1,88 @@
+# apps/bookstore_app/stock_ledger.py
+
+import atexit
+import threading
+
+class StockLedger:
+    """
+    Concurrency-safe stock changes for point-of-sale workers. Each book maps to one of
+    a fixed set of striped locks, so threads selling different books rarely contend,
+    and changes are written out in batches instead of one save per sale. A batch is
+    committed after `commit_every` changes or once its oldest change is `max_delay`
+    seconds old, and whatever is pending is committed when the interpreter exits.
+    """
+
+    def __init__(self, manager, stripes=64, commit_every=200, max_delay=2.0):
+        self._manager = manager
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self.commit_every = commit_every
+        self.max_delay = max_delay
+
+        self._pending = set() # Books adjusted since the last batch commit
+        self._pending_ops = 0
+        self._pending_lock = threading.Lock()
+        self._commit_lock = threading.Lock() # One batch is written at a time
+        self._timer = None # Commits a partial batch once it is max_delay seconds old
+        atexit.register(self.close) # Don't lose confirmed sales when the interpreter exits
+
+    def lock_for(self, book):
+        """Returns the stripe lock guarding this book's stock."""
+        return self._stripes[hash(book) % len(self._stripes)]
+
+    def try_decrement(self, book, quantity=1):
+        """
+        Atomically takes `quantity` units if at least that many are in stock.
+        Returns False (and changes nothing) when it would oversell.
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        with self.lock_for(book):
+            if book.stock < quantity:
+                return False
+            book.stock -= quantity
+        self._record(book)
+        return True
+
+    def increment(self, book, quantity=1):
+        """Atomically adds `quantity` units (e.g. a return or a delivery)."""
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        with self.lock_for(book):
+            book.stock += quantity
+        self._record(book)
+
+    def _record(self, book):
+        # Never called with a stripe lock held, so taking the manager lock here can't deadlock
+        self._manager._stock_changed(book)
+        with self._pending_lock:
+            self._pending.add(book)
+            self._pending_ops += 1
+            batch_full = self._pending_ops >= self.commit_every
+            if not batch_full and self._timer is None and self.max_delay is not None:
+                self._timer = threading.Timer(self.max_delay, self.commit)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch_full:
+            self.commit()
+
+    def commit(self):
+        """Writes every pending adjustment in one batch. Returns True on success."""
+        with self._commit_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, set()
+                self._pending_ops = 0
+                if self._timer is not None:
+                    self._timer.cancel() # No-op when this commit is the timer firing
+                    self._timer = None
+            if not batch:
+                return True
+            ok = self._manager._commit_stock_batch(batch)
+            if not ok:
+                with self._pending_lock:
+                    self._pending |= batch # Keep them for the next attempt
+            return ok
+
+    def close(self):
+        """Commits whatever is pending and stops the exit hook. Returns True on success."""
+        atexit.unregister(self.close)
+        return self.commit()
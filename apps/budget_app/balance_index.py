@@ -0,0 +1,77 @@
+# apps/budget_app/balance_index.py
+
+class BalanceIndex:
+    """
+    Fenwick (binary indexed) tree of net cents per calendar day. Adding a transaction on any
+    date, back-dated ones included, and asking for the running total up to a date both cost
+    O(log D), where D is the number of days covered. The covered range grows on demand.
+    """
+
+    def __init__(self):
+        self._base = None # Day ordinal stored in slot 1
+        self._days = []   # Net cents per day (plain values, used to rebuild when the range grows)
+        self._tree = [0]  # 1-based Fenwick array over _days
+
+    def rebuild(self, entries):
+        """Indexes (ordinal, cents) pairs at once in O(N + D)."""
+        entries = list(entries)
+        if not entries:
+            self.__init__()
+            return
+        low = min(ordinal for ordinal, _ in entries)
+        high = max(ordinal for ordinal, _ in entries)
+        self._base = low
+        self._days = [0] * (high - low + 1)
+        for ordinal, cents in entries:
+            self._days[ordinal - low] += cents
+        self._build_tree()
+
+    def _build_tree(self):
+        # Linear construction: each node pushes its sum to its parent once
+        n = len(self._days)
+        tree = [0] + self._days
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _cover(self, ordinal):
+        """Grows the day range (at least doubling it) so that `ordinal` has a slot."""
+        if self._base is None:
+            self._base = ordinal
+            self._days = [0]
+            self._tree = [0, 0]
+            return
+        size = len(self._days)
+        if self._base <= ordinal < self._base + size:
+            return
+        if ordinal < self._base:
+            extra = max(self._base - ordinal, size)
+            self._days = [0] * extra + self._days
+            self._base -= extra
+        else:
+            extra = max(ordinal - self._base - size + 1, size)
+            self._days.extend([0] * extra)
+        self._build_tree()
+
+    def add(self, ordinal, cents):
+        self._cover(ordinal)
+        offset = ordinal - self._base
+        self._days[offset] += cents
+        i = offset + 1
+        n = len(self._days)
+        while i <= n:
+            self._tree[i] += cents
+            i += i & -i
+
+    def total_through(self, ordinal):
+        """Sum of cents on all days up to and including `ordinal`."""
+        if self._base is None or ordinal < self._base:
+            return 0
+        i = min(ordinal - self._base + 1, len(self._days))
+        total = 0
+        while i:
+            total += self._tree[i]
+            i -= i & -i
+        return total
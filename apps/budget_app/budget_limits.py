@@ -0,0 +1,140 @@
+# apps/budget_app/budget_limits.py
+
+import json
+from datetime import date
+from pathlib import Path
+from apps.budget_app.transaction import Transaction
+from apps.budget_app.partitions import month_key
+from shared.utils import atomic_write_json
+from colorama import Fore, Style
+
+LIMITS_FILE = 'budget_limits.json' # {category: monthly cap in euros}
+
+def save_limits_to_file(limits, path=LIMITS_FILE):
+    """Saves {category: cap} to a JSON file (atomically, so a crash can't leave it half-written)."""
+    try:
+        atomic_write_json(path, limits)
+        return True
+    except IOError as e:
+        print(f"{Fore.RED}✗ Error saving budget limits: {e}{Style.RESET_ALL}")
+        return False
+
+def load_limits_from_file(path=LIMITS_FILE):
+    """Loads {category: cap} from a JSON file; no file means no limits."""
+    if not Path(path).exists():
+        return {}
+    try:
+        with open(path, 'r') as f:
+            limits = json.load(f)
+        if not isinstance(limits, dict):
+            print(f"{Fore.RED}✗ Budget limits file '{path}' should hold an object of {{category: limit}}. Starting without limits.{Style.RESET_ALL}")
+            return {}
+        return limits
+    except json.JSONDecodeError:
+        print(f"{Fore.RED}✗ Budget limits file '{path}' is corrupted. Starting without limits.{Style.RESET_ALL}")
+        return {}
+    except IOError as e:
+        print(f"{Fore.RED}✗ Error loading budget limits: {e}{Style.RESET_ALL}")
+        return {}
+
+def print_breach(category, spent, limit):
+    """Default breach alert."""
+    print(f"{Fore.RED}⚠ Budget limit exceeded for {category}: €{spent:.2f} spent this month (limit €{limit:.2f}).{Style.RESET_ALL}")
+
+class BudgetLimits:
+    """
+    Monthly spending caps per expense category. The current month's spend per category is a
+    running counter updated by BudgetTracker on every change, so each check is O(1).
+    `on_breach(category, spent, limit)` fires the moment a category goes over its cap
+    (once per month, or again if it dropped back under the cap in between).
+    """
+
+    def __init__(self, path=LIMITS_FILE, on_breach=print_breach):
+        self.path = path
+        self.on_breach = on_breach
+        self._limits = {} # category -> cap in cents
+        for category, amount in load_limits_from_file(path).items():
+            try:
+                self._limits[Transaction._validate_category(category)] = round(Transaction._validate_amount(amount) * 100)
+            except ValueError as e:
+                print(f"{Fore.YELLOW}⚠ Ignoring budget limit for '{category}': {e}{Style.RESET_ALL}")
+        self._month = None     # 'YYYY-MM' being tracked; None while the tracker is (re)loading
+        self._spent = {}       # category -> cents spent in _month
+        self._over = set()     # Categories already reported as over their cap this month
+
+    @property
+    def limits(self):
+        """{category: monthly cap in euros}."""
+        return {category: cents / 100 for category, cents in self._limits.items()}
+
+    def set_limit(self, category, amount):
+        """Sets (or replaces) a category's monthly cap and saves the limits file."""
+        try:
+            category = Transaction._validate_category(category)
+            if category == Transaction.INCOME_CATEGORY:
+                raise ValueError(f"'{category}' is income; limits apply to expense categories.")
+            cap = round(Transaction._validate_amount(amount) * 100)
+        except ValueError as e:
+            print(f"{Fore.RED}✗ Failed to set budget limit: {e}{Style.RESET_ALL}")
+            return False
+        self._limits[category] = cap
+        self._over.discard(category)
+        self._check(category) # The month may already be over the new cap
+        if save_limits_to_file(self.limits, self.path):
+            print(f"{Fore.GREEN}✓ Monthly limit for {category} set to €{cap / 100:.2f}.{Style.RESET_ALL}")
+            return True
+        return False
+
+    def remove_limit(self, category):
+        """Drops a category's cap. Returns True if it had one."""
+        category = category.strip().capitalize()
+        if self._limits.pop(category, None) is None:
+            print(f"{Fore.YELLOW}⚠ No budget limit set for '{category}'.{Style.RESET_ALL}")
+            return False
+        self._over.discard(category)
+        return save_limits_to_file(self.limits, self.path)
+
+    def suspend(self):
+        """Stops tracking while the tracker rebuilds its ledger (no alerts for loaded history)."""
+        self._month = None
+
+    def reset(self, spent_cents):
+        """Starts tracking the current month from {category: cents already spent}. Categories
+        that are already over their cap count as reported, so loading doesn't raise alerts."""
+        self._month = month_key(date.today())
+        self._spent = {c: cents for c, cents in spent_cents.items() if c != Transaction.INCOME_CATEGORY}
+        self._over = {c for c, cap in self._limits.items() if self._spent.get(c, 0) > cap}
+
+    def record(self, transaction, sign):
+        """Adds (+1) or removes (-1) one transaction's effect, then checks its category's cap."""
+        if self._month is None or transaction.is_income:
+            return
+        self._roll_over()
+        if month_key(transaction.date) != self._month:
+            return # Only the current month counts
+        category = transaction.category
+        self._spent[category] = self._spent.get(category, 0) + sign * transaction.amount_cents
+        self._check(category)
+
+    def _roll_over(self):
+        if self._month is not None and self._month != month_key(date.today()):
+            self.reset({}) # A new month started while the app was running
+
+    def _check(self, category):
+        cap = self._limits.get(category)
+        if cap is None:
+            return
+        spent = self._spent.get(category, 0)
+        if spent > cap:
+            if category not in self._over:
+                self._over.add(category)
+                if self.on_breach is not None:
+                    self.on_breach(category, spent / 100, cap / 100)
+        else:
+            self._over.discard(category) # Back under the cap (e.g. after a removal); can alert again
+
+    def status(self):
+        """{category: (spent this month, cap)} in euros for every category with a limit."""
+        self._roll_over()
+        return {category: (self._spent.get(category, 0) / 100, cap / 100)
+                for category, cap in sorted(self._limits.items())}
@@ -2,10 +2,18 @@
 
 import json
 import os
+import bisect
+from datetime import date, timedelta
 from pathlib import Path
 from apps.budget_app.transaction import Transaction # Import the Transaction class
+from apps.budget_app.columnar import TransactionColumns
+from apps.budget_app.partitions import month_key
+from apps.budget_app.balance_index import BalanceIndex
+from apps.budget_app.budget_limits import BudgetLimits
+from apps.budget_app.statement_import import iter_statement, iter_chunks
+from shared.importing import ImportReport
 from colorama import Fore, Style
-from collections import defaultdict # Useful for grouping
+from collections import defaultdict, Counter # Useful for grouping
 
 DATA_FILE = 'transactions.json' # File to store transaction data
 
@@ -48,24 +56,230 @@ def load_transactions_from_file():
         print(f"{Fore.RED}✗ An unexpected error occurred while loading: {e}{Style.RESET_ALL}")
         return []
 
+ROLLUP_PERIODS = ('month', 'quarter', 'year')
+
+def _transaction_date(t):
+    return t.date
+
+def _net_cents(t):
+    """Signed effect on the balance: income adds, expenses subtract."""
+    return t.amount_cents if t.is_income else -t.amount_cents
+
+def _as_date(value):
+    """Accepts a date or a 'YYYY-MM-DD' string."""
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+def _period_keys(d):
+    """The month, quarter and year a date falls in, e.g. ('2024-03', '2024-Q1', '2024')."""
+    return (f"{d.year:04d}-{d.month:02d}", f"{d.year:04d}-Q{(d.month - 1) // 3 + 1}", f"{d.year:04d}")
+
+def _period_bounds(period, key):
+    """First and last day of a period key produced by _period_keys()."""
+    year = int(key[:4])
+    if period == 'year':
+        first_month, last_month = 1, 12
+    elif period == 'quarter':
+        first_month = (int(key[-1]) - 1) * 3 + 1
+        last_month = first_month + 2
+    else:
+        first_month = last_month = int(key[5:7])
+    next_month_start = date(year + 1, 1, 1) if last_month == 12 else date(year, last_month + 1, 1)
+    return date(year, first_month, 1), date.fromordinal(next_month_start.toordinal() - 1)
+
+class CategoryView:
+    """Lazy, read-only view of one category's transactions, in date order."""
+
+    def __init__(self, tracker, category):
+        self._tracker = tracker
+        self.category = category
+
+    def __iter__(self):
+        return iter(self._tracker._category_groups().get(self.category, ()))
+
+    def __len__(self):
+        return self._tracker._category_counts.get(self.category, 0)
+
+    @property
+    def total(self):
+        return self._tracker._category_cents.get(self.category, 0) / 100
+
 class BudgetTracker:
-    def __init__(self):
-        self.transactions = []
+    def __init__(self, ledger=None, store=None, limits=None):
+        if ledger is not None and store is not None:
+            raise ValueError("Use either a ledger or a partitioned store, not both.")
+        # Optional TransactionLedger: every change is appended to a log instead of waiting for "Save"
+        self._ledger = ledger
+        # Optional PartitionedStore: per-month files, read only when a query needs them
+        self._store = store
+        self._transactions = []
+        self._loaded = True # False while only the store's manifest is in memory
+        self._ordinals = [] # date.toordinal() of each transaction, aligned with the date-sorted list
+        # Running aggregates in cents, kept current on every add/remove/load
+        self._category_cents = defaultdict(int)
+        self._category_counts = defaultdict(int)
+        self._income_cents = 0
+        self._expense_cents = 0
+        self._month_counts = defaultdict(int) # 'YYYY-MM' -> number of transactions in that month
+        self._period_cache = {} # (period, key) -> {category: cents}, dropped only when that period changes
+        self._columns = None # Cached TransactionColumns (NumPy), rebuilt on demand after changes
+        self._by_category = None # Cached {category: date-sorted transactions}, one pass shared by every CategoryView
+        self._fingerprints = Counter() # Transaction.fingerprint -> how many entries share it
+        self._balance = None # BalanceIndex of net cents per day, built on the first balance query
+        # Monthly caps per category, fed by _account() so each check is O(1)
+        self.limits = limits if limits is not None else BudgetLimits()
         self._load_initial_data()
 
     def _load_initial_data(self):
         """Loads transaction data when the manager is initialized."""
-        self.transactions = load_transactions_from_file()
-        # Sort transactions by date after loading
-        self.transactions.sort(key=lambda t: t.date)
+        if self._store is not None:
+            self._open_store()
+        else:
+            self._set_transactions(self._read_transactions())
+
+    def _start_limits(self):
+        """Seeds the limits' running counters with this month's spend (from cached aggregates)."""
+        self.limits.reset(self._period_summary('month', month_key(date.today())))
 
-    def add_transaction(self, date_str, category, amount):
-        """Adds a new transaction."""
+    def _open_store(self):
+        """Builds the aggregates from the store's manifest alone; no partition is read."""
+        ok = self._store.open()
+        self._transactions = []
+        self._ordinals = []
+        self._loaded = False
+        self._reset_aggregates()
+        for month, entry in self._store.months.items():
+            self._month_counts[month] = entry["count"]
+            for category, (count, cents) in entry["categories"].items():
+                self._category_counts[category] += count
+                self._category_cents[category] += cents
+                if category == Transaction.INCOME_CATEGORY:
+                    self._income_cents += cents
+                else:
+                    self._expense_cents += cents
+        self._start_limits()
+        return ok
+
+    @property
+    def transactions(self):
+        """The whole date-sorted ledger. With a partitioned store, the first access reads every partition."""
+        if not self._loaded:
+            self._transactions = self._store.load_all() # Months come back in order, each one sorted
+            self._ordinals = [t.date.toordinal() for t in self._transactions]
+            self._fingerprints = Counter(t.fingerprint for t in self._transactions)
+            self._loaded = True
+        return self._transactions
+
+    def __len__(self):
+        return sum(self._month_counts.values())
+
+    def _read_transactions(self):
+        if self._ledger is not None:
+            return self._ledger.replay()
+        return load_transactions_from_file()
+
+    def _logged(self, write, *args):
+        """Appends a change to the ledger, compacting it once the log has grown enough."""
         try:
-            new_transaction = Transaction(date_str, category, amount)
-            self.transactions.append(new_transaction)
-            # Re-sort list after adding a new transaction
-            self.transactions.sort(key=lambda t: t.date)
+            write(*args)
+            if self._ledger.should_compact():
+                self._ledger.compact(self._transactions)
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error writing to the transaction ledger: {e}{Style.RESET_ALL}")
+
+    def _set_transactions(self, transactions):
+        """Replaces the ledger, sorting it by date once and rebuilding the lookup arrays."""
+        # Sort transactions by date after loading (stable, so same-day entries keep file order)
+        transactions.sort(key=_transaction_date)
+        self._transactions = transactions
+        self._ordinals = [t.date.toordinal() for t in transactions]
+        self._loaded = True
+        self._reset_aggregates()
+        for t in transactions:
+            self._account(t, +1)
+        self._start_limits()
+
+    def _reset_aggregates(self):
+        self._category_cents = defaultdict(int)
+        self._category_counts = defaultdict(int)
+        self._income_cents = 0
+        self._expense_cents = 0
+        self._month_counts = defaultdict(int)
+        self._period_cache = {}
+        self._columns = None
+        self._by_category = None
+        self._fingerprints = Counter()
+        self._balance = None
+        self.limits.suspend() # Loaded history mustn't raise alerts
+
+    def _account(self, transaction, sign):
+        """Adds (sign=+1) or subtracts (sign=-1) one transaction from the running aggregates."""
+        cents = transaction.amount_cents
+        category = transaction.category
+        self._category_cents[category] += sign * cents
+        self._category_counts[category] += sign
+        if not self._category_counts[category]:
+            del self._category_counts[category] # Keep only categories that still have entries
+            del self._category_cents[category]
+        if transaction.is_income:
+            self._income_cents += sign * cents
+        else:
+            self._expense_cents += sign * cents
+
+        month, quarter, year = _period_keys(transaction.date)
+        self._month_counts[month] += sign
+        if not self._month_counts[month]:
+            del self._month_counts[month]
+        # Only the periods this transaction falls in need recomputing
+        self._period_cache.pop(('month', month), None)
+        self._period_cache.pop(('quarter', quarter), None)
+        self._period_cache.pop(('year', year), None)
+        self._columns = None
+        self._by_category = None
+        self.limits.record(transaction, sign)
+        if self._balance is not None: # O(log D), even for back-dated entries
+            self._balance.add(transaction.date.toordinal(), sign * _net_cents(transaction))
+        if self._loaded: # A cold partitioned store keeps fingerprints per month instead
+            fingerprint = transaction.fingerprint
+            self._fingerprints[fingerprint] += sign
+            if not self._fingerprints[fingerprint]:
+                del self._fingerprints[fingerprint]
+
+    def _insert(self, transaction):
+        """Inserts one transaction at its date position in O(log N) comparisons."""
+        if self._loaded:
+            ordinal = transaction.date.toordinal()
+            # bisect_right puts it after existing same-day entries, just like append + stable sort did
+            i = bisect.bisect_right(self._ordinals, ordinal)
+            self._ordinals.insert(i, ordinal)
+            self._transactions.insert(i, transaction)
+        self._account(transaction, +1)
+
+    def fingerprint_count(self, fingerprint):
+        """Number of transactions with this fingerprint, in O(1) (one month's partition when cold)."""
+        if not self._loaded:
+            return self._store.fingerprint_count(fingerprint)
+        return self._fingerprints.get(fingerprint, 0)
+
+    def is_duplicate(self, transaction):
+        """True if an entry with the same date, category, amount and reference is already recorded."""
+        return self.fingerprint_count(transaction.fingerprint) > 0
+
+    def add_transaction(self, date_str, category, amount, reference=None, skip_duplicates=False):
+        """Adds a new transaction. Duplicates are flagged, or refused with skip_duplicates=True."""
+        try:
+            new_transaction = Transaction(date_str, category, amount, reference)
+            if self.is_duplicate(new_transaction):
+                if skip_duplicates:
+                    print(f"{Fore.YELLOW}⚠ Skipped: an identical transaction is already recorded.{Style.RESET_ALL}")
+                    return False
+                print(f"{Fore.YELLOW}⚠ Note: an identical transaction is already recorded.{Style.RESET_ALL}")
+            self._insert(new_transaction)
+            if self._store is not None:
+                self._store.add(new_transaction)
+            if self._ledger is not None:
+                self._logged(self._ledger.append, new_transaction)
             print(f"{Fore.GREEN}✓ Transaction added successfully.{Style.RESET_ALL}")
             return True
         except ValueError as e:
@@ -75,9 +289,236 @@ class BudgetTracker:
             print(f"{Fore.RED}✗ An unexpected error occurred while adding transaction: {e}{Style.RESET_ALL}")
             return False
 
+    def add_transactions(self, transactions):
+        """
+        Bulk-adds already validated Transaction objects. The batch is sorted (linear for
+        pre-sorted input) and merged into the ledger in a single O(N + k) pass.
+        Returns the number of transactions added.
+        """
+        batch = sorted(transactions, key=_transaction_date)
+        if not batch:
+            return 0
+        if len(batch) < 16 or not self._loaded:
+            for t in batch: # Tiny batches are cheaper to insert one by one (and cold ledgers only count them)
+                self._insert(t)
+        else:
+            # Two sorted runs back to back: Timsort spots them and does one linear, stable merge,
+            # so on equal dates existing entries stay first, just as with append + sort
+            self._transactions.extend(batch)
+            self._transactions.sort(key=_transaction_date)
+            self._ordinals = [t.date.toordinal() for t in self._transactions]
+            for t in batch:
+                self._account(t, +1)
+        if self._store is not None:
+            self._store.add_many(batch)
+        if self._ledger is not None:
+            self._logged(self._ledger.append_many, batch) # After merging, so a compaction includes the batch
+        return len(batch)
+
+    def import_statement(self, source, rules=None, columns=None, date_format=None,
+                         chunk_size=50000, progress=None, encoding='utf-8', skip_duplicates=True,
+                         decimal_separator='.'):
+        """
+        Streams a bank-statement CSV (path or open file) into the ledger. Rows are parsed and
+        validated one at a time and merged in chunks of `chunk_size`, so memory stays bounded
+        by the chunk, not the file. `progress(report)` is called after each chunk (by default
+        a progress line is printed). Rows already in the ledger (e.g. from an overlapping
+        statement) are skipped unless skip_duplicates=False. Use decimal_separator=',' for
+        statements written as '12,50'. Returns an ImportReport.
+        """
+        report = ImportReport()
+        if isinstance(source, (str, Path)):
+            with open(source, 'r', encoding=encoding, newline='') as f:
+                self._import_rows(iter_statement(f, report, rules, columns, date_format, decimal_separator),
+                                  chunk_size, report, progress, skip_duplicates)
+        else:
+            self._import_rows(iter_statement(source, report, rules, columns, date_format, decimal_separator),
+                              chunk_size, report, progress, skip_duplicates)
+        print(f"{Fore.GREEN}✓ Import finished: {report}{Style.RESET_ALL}")
+        return report
+
+    def _import_rows(self, rows, chunk_size, report, progress, skip_duplicates):
+        if skip_duplicates:
+            rows = self._without_duplicates(rows, report)
+        for chunk in iter_chunks(rows, chunk_size):
+            self.add_transactions(t for _, t in chunk)
+            report.accept(len(chunk))
+            if progress is not None:
+                progress(report)
+            else:
+                print(f"{Fore.BLUE}… {report.total} rows read, {report.accepted} imported{Style.RESET_ALL}")
+
+    def _without_duplicates(self, rows, report):
+        """
+        Drops rows already in the ledger. Fingerprints are counted as a multiset: the n-th row
+        with a fingerprint is a duplicate only if the ledger held at least n of them before the
+        import, so genuine repeats (two equal coffees on one day) still come in once each.
+        """
+        seen = Counter()
+        already_recorded = {} # fingerprint -> count before this import, looked up on first sight
+        for row_number, t in rows:
+            fingerprint = t.fingerprint
+            if fingerprint not in already_recorded:
+                already_recorded[fingerprint] = self.fingerprint_count(fingerprint)
+            seen[fingerprint] += 1
+            if seen[fingerprint] <= already_recorded[fingerprint]:
+                report.reject(row_number, f"Duplicate of an existing transaction ({t.date.isoformat()}, {t.category}, €{t.amount:.2f}).")
+                continue
+            yield row_number, t
+
+    def remove_transaction(self, transaction):
+        """Removes a transaction (the exact object) from the ledger. Returns True if it was found."""
+        if not self._loaded:
+            if not self._store.remove(transaction):
+                return False
+            self._account(transaction, -1)
+            return True
+        ordinal = transaction.date.toordinal()
+        # Only the entries sharing its date need checking
+        i = bisect.bisect_left(self._ordinals, ordinal)
+        j = bisect.bisect_right(self._ordinals, ordinal, lo=i)
+        for k in range(i, j):
+            if self._transactions[k] is transaction:
+                del self._transactions[k]
+                del self._ordinals[k]
+                self._account(transaction, -1)
+                if self._store is not None:
+                    self._store.remove(transaction)
+                if self._ledger is not None:
+                    self._logged(self._ledger.append_removal, transaction)
+                return True
+        return False
+
+    def between(self, start, end):
+        """Transactions dated from start to end inclusive (dates or 'YYYY-MM-DD'), via bisect."""
+        if not self._loaded:
+            return self._store.between(_as_date(start), _as_date(end)) # Reads only the months involved
+        i = bisect.bisect_left(self._ordinals, _as_date(start).toordinal())
+        j = bisect.bisect_right(self._ordinals, _as_date(end).toordinal(), lo=i)
+        return self._transactions[i:j]
+
+    def _period_summary(self, period, key):
+        """Cached {category: cents} for one period, computed from its date slice on a miss."""
+        summary = self._period_cache.get((period, key))
+        if summary is None:
+            summary = defaultdict(int)
+            if self._store is not None:
+                # The manifest already holds per-month category totals, so no partition is read
+                first, last = (month_key(d) for d in _period_bounds(period, key))
+                for month, entry in self._store.months.items():
+                    if first <= month <= last:
+                        for category, (_, cents) in entry["categories"].items():
+                            summary[category] += cents
+            else:
+                for t in self.between(*_period_bounds(period, key)):
+                    summary[t.category] += t.amount_cents
+            summary = dict(summary)
+            self._period_cache[(period, key)] = summary
+        return summary
+
+    def rollup(self, period='month', by='category'):
+        """
+        Totals per period ('month', 'quarter' or 'year'), oldest first.
+        by='category' gives {period: {category: total}};
+        by=None gives {period: {'income': ..., 'expenses': ..., 'net': ...}}.
+        Period aggregates are cached and only recomputed for periods that changed.
+        """
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Invalid period: '{period}'. Choose from: {', '.join(ROLLUP_PERIODS)}.")
+        if by not in ('category', None):
+            raise ValueError("by must be 'category' or None.")
+
+        index = ROLLUP_PERIODS.index(period)
+        keys = sorted({_period_keys(date(int(m[:4]), int(m[5:7]), 1))[index] for m in self._month_counts})
+
+        result = {}
+        for key in keys:
+            summary = self._period_summary(period, key)
+            if by == 'category':
+                result[key] = {category: cents / 100 for category, cents in sorted(summary.items())}
+            else:
+                income = summary.get(Transaction.INCOME_CATEGORY, 0)
+                expenses = sum(summary.values()) - income
+                result[key] = {'income': income / 100, 'expenses': expenses / 100, 'net': (income - expenses) / 100}
+        return result
+
+    def columns(self):
+        """
+        Columnar (NumPy) view of the ledger for vectorized analytics, built on first use
+        and reused until the next change. Raises ImportError if NumPy isn't installed.
+        """
+        if self._columns is None:
+            self._columns = TransactionColumns(self.transactions)
+        return self._columns
+
+    def balance_at(self, day):
+        """
+        Net balance (income minus expenses) over all transactions up to and including `day`
+        (a date or 'YYYY-MM-DD'), in O(log D) from a Fenwick tree over days.
+        """
+        ordinal = _as_date(day).toordinal()
+        if not self._loaded:
+            return self._cold_balance_at(_as_date(day)) / 100
+        if self._balance is None:
+            self._balance = BalanceIndex()
+            self._balance.rebuild((o, _net_cents(t)) for o, t in zip(self._ordinals, self._transactions))
+        return self._balance.total_through(ordinal) / 100
+
+    def _cold_balance_at(self, day):
+        """Balance in cents from the manifest's month totals plus the partial month, without loading everything."""
+        month = month_key(day)
+        cents = 0
+        for key, entry in self._store.months.items():
+            if key < month:
+                for category, (_, total) in entry["categories"].items():
+                    cents += total if category == Transaction.INCOME_CATEGORY else -total
+        cents += sum(_net_cents(t) for t in self._store.between(day.replace(day=1), day))
+        return cents
+
+    def balance_series(self, start, end, step=1):
+        """
+        [(date, balance)] from start to end inclusive, every `step` days (an int or a timedelta).
+        Each point is one O(log D) lookup.
+        """
+        start, end = _as_date(start), _as_date(end)
+        step = step if isinstance(step, timedelta) else timedelta(days=step)
+        if step.days < 1:
+            raise ValueError("Step must be at least one day.")
+        series = []
+        day = start
+        while day <= end:
+            series.append((day, self.balance_at(day)))
+            day += step
+        return series
+
+    @property
+    def total_income(self):
+        return self._income_cents / 100
+
+    @property
+    def total_expenses(self):
+        return self._expense_cents / 100
+
+    def category_totals(self):
+        """Total amount per category, in O(#categories)."""
+        return {category: cents / 100 for category, cents in self._category_cents.items()}
+
+    def _category_groups(self):
+        """{category: transactions} from a single pass over the ledger, reused until the next change."""
+        if self._by_category is None:
+            groups = defaultdict(list)
+            for t in self.transactions:
+                groups[t.category].append(t)
+            self._by_category = dict(groups)
+        return self._by_category
+
+    def transactions_by_category(self):
+        """Lazy CategoryView per category that has transactions, in O(#categories)."""
+        return {category: CategoryView(self, category) for category in self._category_counts}
+
     def view_all_transactions(self):
         """Displays details of all transactions."""
-        if not self.transactions:
+        if not len(self):
             print(f"{Fore.YELLOW}No transactions recorded yet.{Style.RESET_ALL}")
             return
         
@@ -88,32 +529,28 @@ class BudgetTracker:
 
     def get_transactions_by_category(self):
         """Groups transactions by category and calculates totals for each."""
-        if not self.transactions:
+        if not len(self):
             print(f"{Fore.YELLOW}No transactions to categorize.{Style.RESET_ALL}")
             return
 
-        category_totals = defaultdict(float)
-        category_transactions = defaultdict(list)
+        views = self.transactions_by_category()
 
-        for t in self.transactions:
-            category_totals[t.category] += t.amount
-            category_transactions[t.category].append(t)
-        
         print(f"\n{Fore.CYAN}═══ Transactions By Category ═══{Style.RESET_ALL}")
-        for category in sorted(category_totals.keys()): # Sort categories alphabetically
-            print(f"\n{Fore.BLUE}Category: {category} (Total: €{category_totals[category]:.2f}){Style.RESET_ALL}")
-            for t in category_transactions[category]:
+        for category in sorted(views): # Sort categories alphabetically
+            view = views[category]
+            print(f"\n{Fore.BLUE}Category: {category} (Total: €{view.total:.2f}){Style.RESET_ALL}")
+            for t in view:
                 print(f"  {t}")
         print(f"{Fore.CYAN}═══════════════════════════════{Style.RESET_ALL}")
 
     def calculate_total_expenses(self):
         """Calculates the total sum of all expenses (excluding 'Salary' category)."""
-        if not self.transactions:
+        if not len(self):
             print(f"{Fore.YELLOW}No transactions to calculate total expenses from.{Style.RESET_ALL}")
             return 0.0
         
-        total_expense = sum(t.amount for t in self.transactions if t.category != 'Salary')
-        total_income = sum(t.amount for t in self.transactions if t.category == 'Salary')
+        total_expense = self.total_expenses # Running totals: no pass over the history
+        total_income = self.total_income
 
         print(f"\n{Fore.CYAN}═══ Financial Summary ═══{Style.RESET_ALL}")
         print(f"{Fore.GREEN}Total Income: €{total_income:.2f}{Style.RESET_ALL}")
@@ -124,14 +561,18 @@ class BudgetTracker:
 
     def save_data(self):
         """Wrapper to save all transactions to file."""
-        return save_transactions_to_file(self.transactions)
+        if self._store is not None:
+            return self._store.flush() # Only the months that changed
+        if self._ledger is not None:
+            return self._ledger.compact(self._transactions) # Snapshot + fresh log
+        return save_transactions_to_file(self._transactions)
 
     def load_data(self):
         """Wrapper to load all transactions from file."""
-        loaded_transactions = load_transactions_from_file()
+        if self._store is not None:
+            return self._open_store()
+        loaded_transactions = self._read_transactions()
         if loaded_transactions is not None:
-            self.transactions = loaded_transactions
-            # Ensure loaded data is sorted
-            self.transactions.sort(key=lambda t: t.date)
+            self._set_transactions(loaded_transactions) # Ensure loaded data is sorted
             return True
         return False
\ No newline at end of file
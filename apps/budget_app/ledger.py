@@ -0,0 +1,127 @@
+# apps/budget_app/ledger.py
+
+import atexit
+import json
+import time
+from pathlib import Path
+from apps.budget_app.transaction import Transaction
+from shared.append_log import AppendLog, sha256_digest
+from shared.utils import atomic_write_bytes
+from colorama import Fore, Style
+
+SNAPSHOT_FILE = 'transactions.json' # Same plain list format save_transactions_to_file() writes
+LOG_FILE = 'transactions.jsonl'     # One JSON object per line, appended after the snapshot
+
+def _entry_key(entry):
+    return (entry["date"], entry["category"], entry["amount"], entry.get("reference"))
+
+class TransactionLedger:
+    """
+    Append-only storage for BudgetTracker. Every accepted transaction is appended to
+    LOG_FILE as one JSON line, so adding costs O(1) I/O no matter how long the history is.
+    Startup replays the snapshot plus the log; compact() folds the log back into the snapshot.
+
+    Lines reach the OS on every append (a crashed process loses nothing); fsync runs once
+    per `sync_every` appends or `sync_interval` seconds, which bounds what a power cut can lose.
+    """
+
+    def __init__(self, snapshot_path=SNAPSHOT_FILE, log_path=LOG_FILE,
+                 sync_every=64, sync_interval=1.0, compact_min=10000):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        # Never compact for fewer log entries than compact_min
+        self._log = AppendLog(log_path, snapshot_path, compact_min)
+        self._last_sync = time.monotonic()
+        atexit.register(self.close) # Don't leave the last batch un-fsynced at exit
+
+    def _read_snapshot(self):
+        """Returns (entries, digest) for the snapshot file, ([], '') if it doesn't exist."""
+        if not Path(self.snapshot_path).exists():
+            return [], ''
+        with open(self.snapshot_path, 'rb') as f:
+            data = f.read()
+        return json.loads(data), sha256_digest(data)
+
+    def _read_log(self, entries, digest):
+        """Applies the log's lines to `entries` in place and readies the log for appending."""
+        positions = {} # (date, category, amount, reference) -> indexes in `entries`, for replaying removals
+        for i, entry in enumerate(entries):
+            positions.setdefault(_entry_key(entry), []).append(i)
+        removed = 0
+
+        def apply(entry):
+            nonlocal removed
+            key = _entry_key(entry)
+            if entry.pop("op", "add") == "remove":
+                matches = positions.get(key)
+                if matches:
+                    entries[matches.pop()] = None
+                    removed += 1
+            else:
+                positions.setdefault(key, []).append(len(entries))
+                entries.append(entry)
+
+        self._log.open(digest, len(entries), apply)
+        if removed:
+            entries[:] = [entry for entry in entries if entry is not None]
+
+    def replay(self):
+        """Loads every transaction (snapshot, then log) and readies the log for appending."""
+        self.close()
+        try:
+            entries, digest = self._read_snapshot()
+            self._read_log(entries, digest)
+            transactions = [Transaction.from_dict(entry) for entry in entries]
+        except (ValueError, KeyError):
+            print(f"{Fore.RED}✗ Transaction ledger '{self.snapshot_path}' is corrupted. Starting with an empty list.{Style.RESET_ALL}")
+            return []
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error loading transactions: {e}{Style.RESET_ALL}")
+            return []
+        print(f"{Fore.GREEN}✓ Loaded {len(transactions)} transactions from '{self.snapshot_path}' "
+              f"(+{self._log.count} logged changes){Style.RESET_ALL}")
+        return transactions
+
+    def _write(self, entries):
+        self._log.append(entries, sync=False)
+        if self._log.unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def append(self, transaction):
+        """Logs one added transaction."""
+        self._write([transaction.to_dict()])
+
+    def append_many(self, transactions):
+        """Logs a batch of added transactions with a single write."""
+        self._write([t.to_dict() for t in transactions])
+
+    def append_removal(self, transaction):
+        """Logs that a transaction was removed."""
+        self._write([dict(transaction.to_dict(), op="remove")])
+
+    def sync(self):
+        """Forces logged lines to disk."""
+        self._log.sync()
+        self._last_sync = time.monotonic()
+
+    def should_compact(self):
+        """True once the log is as long as the snapshot (and at least compact_min)."""
+        return self._log.should_compact()
+
+    def compact(self, transactions):
+        """Writes `transactions` as the new snapshot and starts an empty log. Returns True on success."""
+        try:
+            data = json.dumps([t.to_dict() for t in transactions]).encode()
+            atomic_write_bytes(self.snapshot_path, data)
+            self._log.reset(sha256_digest(data), len(transactions))
+            print(f"{Fore.GREEN}✓ Transactions saved successfully to '{self.snapshot_path}'{Style.RESET_ALL}")
+            return True
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error saving transactions: {e}{Style.RESET_ALL}")
+            return False
+
+    def close(self):
+        """Syncs and closes the log."""
+        self._log.close()
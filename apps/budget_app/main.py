@@ -28,7 +28,8 @@ def display_main_menu():
     print(f"{Fore.BLUE}4.{Style.RESET_ALL} Calculate Total Expenses")
     print(f"{Fore.BLUE}5.{Style.RESET_ALL} Save Transactions")
     print(f"{Fore.BLUE}6.{Style.RESET_ALL} Load Transactions")
-    print(f"{Fore.BLUE}7.{Style.RESET_ALL} Back to Main Menu")
+    print(f"{Fore.BLUE}7.{Style.RESET_ALL} Monthly Budget Limits")
+    print(f"{Fore.BLUE}8.{Style.RESET_ALL} Back to Main Menu")
     print(f"{Fore.CYAN}═══════════════════════════════════════════════════════{Style.RESET_ALL}")
 
 def get_transaction_details():
@@ -62,6 +63,28 @@ def get_transaction_details():
         'amount': amount
     }
 
+def handle_budget_limits(manager):
+    """Shows this month's spend against each limit and optionally sets a new one."""
+    status = manager.limits.status()
+    print(f"\n{Fore.CYAN}═══ Monthly Budget Limits ═══{Style.RESET_ALL}")
+    if not status:
+        print(f"{Fore.YELLOW}No limits set yet.{Style.RESET_ALL}")
+    for category, (spent, limit) in status.items():
+        color = Fore.RED if spent > limit else Fore.GREEN
+        print(f"  {Fore.BLUE}{category}{Style.RESET_ALL}: {color}€{spent:.2f}{Style.RESET_ALL} of €{limit:.2f}")
+    print(f"{Fore.CYAN}═════════════════════════════{Style.RESET_ALL}")
+
+    category = get_valid_input("Enter a category to set its monthly limit:",
+                               validator=Transaction._validate_category,
+                               error_message=f"{Fore.RED}Invalid category. Choose from the list.{Style.RESET_ALL}")
+    if category is None: return # User cancelled
+    amount = get_valid_input("Enter the monthly limit (e.g., 300):",
+                             type_func=float,
+                             validator=Transaction._validate_amount,
+                             error_message=f"{Fore.RED}Limit must be a positive number.{Style.RESET_ALL}")
+    if amount is None: return # User cancelled
+    manager.limits.set_limit(category, amount)
+
 def run_budget_app():
     setup_app_colors() # Initialize colorama
     manager = BudgetTracker() # Automatically loads data on init
@@ -69,10 +92,10 @@ def run_budget_app():
     while True:
         display_main_menu()
         
-        choice = get_valid_input("Enter your choice (1-7):", 
-                                 validator=lambda x: x if x in ['1','2','3','4','5','6','7'] 
-                                 else (_ for _ in ()).throw(ValueError("Invalid choice. Please enter a number between 1 and 7.")),
-                                 error_message=f"{Fore.RED}Invalid choice. Please enter a number between 1 and 7.{Style.RESET_ALL}") # Added error_message for consistency
+        choice = get_valid_input("Enter your choice (1-8):", 
+                                 validator=lambda x: x if x in ['1','2','3','4','5','6','7','8'] 
+                                 else (_ for _ in ()).throw(ValueError("Invalid choice. Please enter a number between 1 and 8.")),
+                                 error_message=f"{Fore.RED}Invalid choice. Please enter a number between 1 and 8.{Style.RESET_ALL}") # Added error_message for consistency
         
         if choice is None: # User cancelled menu input
             continue 
@@ -100,7 +123,7 @@ def run_budget_app():
             manager.save_data()
         
         elif choice == '6': # Load Transactions
-            if manager.transactions: # Only ask if there's data in memory
+            if len(manager): # Only ask if there's data in memory
                 confirm = get_valid_input(
                     f"{Fore.YELLOW}Warning: Loading new data will overwrite current unsaved changes. Proceed? (yes/no):{Style.RESET_ALL} ",
                     validator=lambda x: x.lower() if x.lower() in ['yes', 'no'] else (_ for _ in ()).throw(ValueError("Invalid input. Please enter 'yes' or 'no'.")))
@@ -110,7 +133,10 @@ def run_budget_app():
             
             manager.load_data() # This will reassign manager.transactions internally
         
-        elif choice == '7': # Back to Main Menu
+        elif choice == '7': # Monthly Budget Limits
+            handle_budget_limits(manager)
+
+        elif choice == '8': # Back to Main Menu
             print(f"{Fore.BLUE}Returning to main application menu.{Style.RESET_ALL}")
             break
         
\ No newline at end of file
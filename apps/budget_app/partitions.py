@@ -0,0 +1,254 @@
+# apps/budget_app/partitions.py
+
+import bisect
+import json
+import os
+from collections import Counter, OrderedDict
+from pathlib import Path
+from apps.budget_app.transaction import Transaction
+from shared.utils import atomic_write_json
+from colorama import Fore, Style
+
+LEGACY_FILE = 'transactions.json' # Single-file history, split into partitions on first open
+MANIFEST_FILE = 'manifest.json'
+
+def month_key(d):
+    """'YYYY-MM' partition a date belongs to."""
+    return f"{d.year:04d}-{d.month:02d}"
+
+def _transaction_ordinal(t):
+    return t.date.toordinal()
+
+class PartitionedStore:
+    """
+    Stores transactions in one JSON file per month plus a small manifest holding each
+    month's count and per-category [count, cents]. Opening reads only the manifest;
+    a partition is parsed the first time a query needs it and kept in an LRU cache of
+    `cache_size` months. Months with unsaved changes stay cached until flush().
+    """
+
+    def __init__(self, directory='transactions', cache_size=12, legacy_file=LEGACY_FILE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.legacy_file = legacy_file
+        self.months = {}            # 'YYYY-MM' -> {"count": n, "categories": {category: [count, cents]}}
+        self._cache = OrderedDict() # 'YYYY-MM' -> date-sorted transactions, least recently used first
+        self._dirty = set()         # Months changed since the last flush
+        self._fingerprints = {}     # 'YYYY-MM' -> Counter of Transaction.fingerprint, for cached months
+        self._ordinals = {}         # 'YYYY-MM' -> date ordinals aligned with a cached month, built on first bisect
+        self._manifest_dirty = False
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def open(self):
+        """(Re)reads the manifest, dropping unsaved changes. Splits a legacy file on first use."""
+        self._cache.clear()
+        self._fingerprints.clear()
+        self._ordinals.clear()
+        self._dirty.clear()
+        self._manifest_dirty = False
+        manifest_path = self._path(MANIFEST_FILE)
+        try:
+            if Path(manifest_path).exists():
+                with open(manifest_path, 'r') as f:
+                    self.months = json.load(f)["months"]
+                print(f"{Fore.GREEN}✓ Found {sum(m['count'] for m in self.months.values())} transactions "
+                      f"in {len(self.months)} monthly partitions under '{self.directory}/'{Style.RESET_ALL}")
+            elif Path(self.legacy_file).exists():
+                self._migrate_legacy()
+            else:
+                self.months = {}
+                print(f"{Fore.YELLOW}⚠ No transaction partitions found in '{self.directory}/'. Starting with an empty list.{Style.RESET_ALL}")
+            return True
+        except (ValueError, KeyError):
+            print(f"{Fore.RED}✗ Partition manifest '{manifest_path}' is corrupted. Starting with an empty list.{Style.RESET_ALL}")
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error loading transactions: {e}{Style.RESET_ALL}")
+        self.months = {}
+        return False
+
+    def _migrate_legacy(self):
+        with open(self.legacy_file, 'r') as f:
+            transactions = [Transaction.from_dict(t_data) for t_data in json.load(f)]
+        transactions.sort(key=_transaction_ordinal)
+        self.months = {}
+        for t in transactions:
+            self._cache.setdefault(month_key(t.date), []).append(t)
+            self._note(t, +1)
+        self._dirty = set(self._cache)
+        self.flush(verbose=False)
+        print(f"{Fore.GREEN}✓ Split {len(transactions)} transactions from '{self.legacy_file}' "
+              f"into {len(self.months)} monthly partitions under '{self.directory}/'{Style.RESET_ALL}")
+
+    def _note(self, transaction, sign):
+        """Keeps the manifest entry of the transaction's month in step with a change."""
+        month = month_key(transaction.date)
+        entry = self.months.setdefault(month, {"count": 0, "categories": {}})
+        entry["count"] += sign
+        counted = entry["categories"].setdefault(transaction.category, [0, 0])
+        counted[0] += sign
+        counted[1] += sign * transaction.amount_cents
+        if not counted[0]:
+            del entry["categories"][transaction.category]
+        if not entry["count"]:
+            del self.months[month]
+        self._manifest_dirty = True
+
+    def _read_partition(self, month):
+        path = self._path(f"{month}.json")
+        if not Path(path).exists():
+            return []
+        with open(path, 'r') as f:
+            transactions = [Transaction.from_dict(t_data) for t_data in json.load(f)]
+        entry = self.months.get(month)
+        if entry is None or entry["count"] != len(transactions):
+            # The manifest is written last, so a crash mid-flush can leave it behind a partition
+            self._recount(month, transactions)
+        return transactions
+
+    def _recount(self, month, transactions):
+        categories = {}
+        for t in transactions:
+            counted = categories.setdefault(t.category, [0, 0])
+            counted[0] += 1
+            counted[1] += t.amount_cents
+        if transactions:
+            self.months[month] = {"count": len(transactions), "categories": categories}
+        else:
+            self.months.pop(month, None)
+        self._manifest_dirty = True
+
+    def partition(self, month):
+        """Date-sorted transactions of one month, loaded through the LRU cache."""
+        transactions = self._cache.get(month)
+        if transactions is not None:
+            self._cache.move_to_end(month)
+            return transactions
+        transactions = self._read_partition(month)
+        self._cache[month] = transactions
+        self._evict()
+        return transactions
+
+    def _evict(self):
+        """Drops least recently used months beyond cache_size; unsaved ones and the newest are kept."""
+        excess = len(self._cache) - self.cache_size
+        for month in list(self._cache)[:-1]:
+            if excess <= 0:
+                break
+            if month not in self._dirty:
+                del self._cache[month]
+                self._fingerprints.pop(month, None)
+                self._ordinals.pop(month, None)
+                excess -= 1
+
+    def _month_ordinals(self, month, transactions):
+        """Date ordinals of a cached month's transactions, for bisecting by date."""
+        ordinals = self._ordinals.get(month)
+        if ordinals is None:
+            ordinals = self._ordinals[month] = [t.date.toordinal() for t in transactions]
+        return ordinals
+
+    def fingerprint_count(self, fingerprint):
+        """How many stored transactions share this fingerprint. Duplicates always share a month,
+        so only that month is read, and its fingerprints are counted once while it stays cached."""
+        month = month_key(fingerprint[0])
+        if month not in self.months:
+            return 0
+        partition = self.partition(month)
+        counts = self._fingerprints.get(month)
+        if counts is None:
+            counts = self._fingerprints[month] = Counter(t.fingerprint for t in partition)
+        return counts[fingerprint]
+
+    def between(self, start, end):
+        """Transactions dated from start to end inclusive (date objects), reading only the months involved."""
+        first, last = month_key(start), month_key(end)
+        low, high = start.toordinal(), end.toordinal()
+        result = []
+        for month in sorted(m for m in self.months if first <= m <= last):
+            transactions = self.partition(month)
+            ordinals = self._month_ordinals(month, transactions)
+            i = bisect.bisect_left(ordinals, low)
+            j = bisect.bisect_right(ordinals, high, lo=i)
+            result.extend(transactions[i:j])
+        return result
+
+    def load_all(self):
+        """Every transaction, oldest first. Partitions not already cached are read without filling the cache."""
+        result = []
+        for month in sorted(self.months):
+            cached = self._cache.get(month)
+            result.extend(cached if cached is not None else self._read_partition(month))
+        return result
+
+    def add(self, transaction):
+        self.add_many([transaction])
+
+    def add_many(self, transactions):
+        by_month = {}
+        for t in transactions:
+            by_month.setdefault(month_key(t.date), []).append(t)
+        for month, batch in by_month.items():
+            self._dirty.add(month) # Before loading, so the cache can't evict it
+            partition = self.partition(month)
+            # Stable sort of two runs: a linear merge, with existing same-day entries first
+            partition.extend(batch)
+            partition.sort(key=_transaction_ordinal)
+            self._ordinals.pop(month, None) # Rebuilt on the next bisect
+            counts = self._fingerprints.get(month)
+            if counts is not None:
+                counts.update(t.fingerprint for t in batch)
+            for t in batch:
+                self._note(t, +1)
+
+    def remove(self, transaction):
+        """Removes the transaction (or an equal one) from its month. Returns True if it was found."""
+        month = month_key(transaction.date)
+        if month not in self.months:
+            return False
+        self._dirty.add(month)
+        partition = self.partition(month)
+        ordinals = self._month_ordinals(month, partition)
+        ordinal = transaction.date.toordinal()
+        i = bisect.bisect_left(ordinals, ordinal)
+        j = bisect.bisect_right(ordinals, ordinal, lo=i)
+        candidates = range(i, j)
+        match = next((k for k in candidates if partition[k] is transaction), None)
+        if match is None: # Loaded through load_all(), so a different but equal object
+            match = next((k for k in candidates if partition[k].to_dict() == transaction.to_dict()), None)
+        if match is None:
+            return False
+        removed = partition.pop(match)
+        del ordinals[match]
+        counts = self._fingerprints.get(month)
+        if counts is not None:
+            counts[removed.fingerprint] -= 1
+            if not counts[removed.fingerprint]:
+                del counts[removed.fingerprint]
+        self._note(transaction, -1)
+        return True
+
+    def flush(self, verbose=True):
+        """Writes changed partitions, then the manifest. Returns True on success."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for month in sorted(self._dirty):
+                path = self._path(f"{month}.json")
+                transactions = self._cache.get(month, [])
+                if transactions:
+                    atomic_write_json(path, [t.to_dict() for t in transactions])
+                elif Path(path).exists():
+                    os.remove(path) # Month emptied out
+            if self._dirty or self._manifest_dirty:
+                atomic_write_json(self._path(MANIFEST_FILE), {"months": self.months})
+            saved = len(self._dirty)
+            self._dirty.clear()
+            self._manifest_dirty = False
+            self._evict()
+            if verbose:
+                print(f"{Fore.GREEN}✓ Transactions saved successfully to '{self.directory}/' ({saved} partitions written){Style.RESET_ALL}")
+            return True
+        except IOError as e:
+            print(f"{Fore.RED}✗ Error saving transactions: {e}{Style.RESET_ALL}")
+            return False
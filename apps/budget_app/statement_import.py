@@ -0,0 +1,138 @@
+# apps/budget_app/statement_import.py
+
+import csv
+import json
+import re
+from datetime import datetime
+from itertools import islice
+from apps.budget_app.transaction import Transaction
+
+# Statement column each Transaction field is read from; category and reference are optional
+DEFAULT_COLUMNS = {'date': 'date', 'description': 'description', 'amount': 'amount',
+                   'category': 'category', 'reference': 'reference'}
+
+# (keyword, category) pairs, checked in order against the lower-cased description
+DEFAULT_RULES = [
+    ('salary', 'Salary'), ('payroll', 'Salary'),
+    ('rent', 'Rent'), ('landlord', 'Rent'),
+    ('supermarket', 'Groceries'), ('grocer', 'Groceries'),
+    ('restaurant', 'Food'), ('cafe', 'Food'), ('pizza', 'Food'),
+    ('uber', 'Transport'), ('taxi', 'Transport'), ('rail', 'Transport'), ('fuel', 'Transport'),
+    ('electric', 'Utilities'), ('water', 'Utilities'), ('internet', 'Utilities'),
+    ('pharmacy', 'Healthcare'), ('doctor', 'Healthcare'),
+    ('cinema', 'Entertainment'), ('netflix', 'Entertainment'), ('spotify', 'Entertainment'),
+    ('tuition', 'Education'), ('school', 'Education'),
+    ('amazon', 'Shopping'),
+]
+
+class CategoryRules:
+    """
+    Maps a statement line to a budget category: the first rule whose keyword appears in the
+    description wins. Unmatched credits count as income, unmatched debits as Miscellaneous.
+    Results are memoized per description, since statements repeat the same merchants.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, income_category=Transaction.INCOME_CATEGORY,
+                 expense_category='Miscellaneous', max_cached=10000):
+        self.rules = [(keyword.casefold(), Transaction._validate_category(category)) for keyword, category in rules]
+        self.income_category = Transaction._validate_category(income_category)
+        self.expense_category = Transaction._validate_category(expense_category)
+        self.max_cached = max_cached
+        self._cache = {} # (description, is_credit) -> category
+
+    @classmethod
+    def from_file(cls, path):
+        """Loads rules from a JSON object of {keyword: category}, kept in file order."""
+        with open(path, 'r') as f:
+            return cls(list(json.load(f).items()))
+
+    def categorize(self, description, is_credit):
+        cache_key = (description, is_credit)
+        category = self._cache.get(cache_key)
+        if category is None:
+            text = description.casefold()
+            category = next((c for keyword, c in self.rules if keyword in text), None)
+            if category is None:
+                category = self.income_category if is_credit else self.expense_category
+            if len(self._cache) < self.max_cached:
+                self._cache[cache_key] = category
+        return category
+
+# A number whose integer part is either plain digits or correctly grouped in threes by `sep`
+_GROUPED = r'^[+-]?(\d+|\d{{1,3}}(\{sep}\d{{3}})+)(\{dec}\d*)?$'
+_AMOUNT_PATTERNS = {
+    '.': re.compile(_GROUPED.format(sep=',', dec='.')), # 1,200.50
+    ',': re.compile(_GROUPED.format(sep='.', dec=',')), # 1.200,50
+}
+
+def _parse_amount(text, decimal_separator='.'):
+    """
+    Signed amount from statement text such as '-12.50', '€1,200.00' or '(8.99)'; with
+    decimal_separator=',' European forms such as '-12,50' or '1.200,00'. The other
+    separator is only accepted as a thousands separator in groups of three, so a value
+    such as '-12,50' in a '.' statement is rejected instead of being read as 1250.
+    """
+    if decimal_separator not in _AMOUNT_PATTERNS:
+        raise ValueError(f"Invalid decimal separator: '{decimal_separator}'. Use '.' or ','.")
+    raw = text.strip()
+    text = raw.replace('€', '').replace(' ', '')
+    negative = text.startswith('(') and text.endswith(')')
+    if negative:
+        text = text[1:-1]
+    if not _AMOUNT_PATTERNS[decimal_separator].match(text):
+        raise ValueError(f"Invalid or ambiguous amount: '{raw}' (decimal separator is '{decimal_separator}').")
+    thousands = ',' if decimal_separator == '.' else '.'
+    value = float(text.replace(thousands, '').replace(decimal_separator, '.'))
+    return -value if negative else value
+
+def iter_statement(file_obj, report, rules=None, columns=None, date_format=None, decimal_separator='.'):
+    """
+    Generator of (row_number, Transaction) pairs from bank-statement CSV rows, one at a time.
+    Negative amounts are debits (expenses) and positive ones credits; `decimal_separator`
+    is '.' (12.50) or ',' (12,50) depending on the bank. A valid category column
+    is used as is; otherwise the description goes through `rules`. A row whose sign doesn't
+    fit its category (a credit filed under an expense category, or a debit as income) is
+    rejected rather than flipped. Rows that fail validation are recorded in `report` and
+    skipped; accepting the rest is up to the caller.
+    """
+    rules = rules or CategoryRules()
+    columns = dict(DEFAULT_COLUMNS, **(columns or {}))
+    reader = csv.DictReader(file_obj)
+    for row in reader:
+        row_number = reader.line_num
+        try:
+            raw_date = (row.get(columns['date']) or '').strip()
+            raw_amount = row.get(columns['amount']) or ''
+            if not raw_date or not raw_amount.strip():
+                raise ValueError("Missing date or amount.")
+            if date_format:
+                # Normalize bank-specific formats (e.g. 27/10/2023) to the ISO form Transaction expects
+                try:
+                    raw_date = datetime.strptime(raw_date, date_format).date().isoformat()
+                except ValueError:
+                    raise ValueError(f"Date '{raw_date}' does not match format '{date_format}'.")
+            amount = _parse_amount(raw_amount, decimal_separator)
+
+            category = (row.get(columns['category']) or '').strip()
+            if category.capitalize() not in Transaction.VALID_CATEGORIES:
+                category = rules.categorize(row.get(columns['description']) or '', amount > 0)
+            # Transaction's constructor runs the same validators as add_transaction
+            transaction = Transaction(raw_date, category, abs(amount), row.get(columns['reference']))
+            if transaction.is_income != (amount > 0):
+                # e.g. a refund matching an expense rule, or a reversed salary payment
+                kind = 'credit' if amount > 0 else 'debit'
+                raise ValueError(f"A {kind} of €{abs(amount):.2f} can't be recorded as '{transaction.category}'; "
+                                 f"only credits count as income ({Transaction.INCOME_CATEGORY}).")
+        except ValueError as e:
+            report.reject(row_number, str(e))
+            continue
+        yield row_number, transaction
+
+def iter_chunks(items, chunk_size):
+    """Splits an iterable into lists of at most chunk_size items."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
@@ -9,22 +9,32 @@ class Transaction:
         'Shopping', 'Salary', 'Groceries', 'Healthcare', 'Education',
         'Miscellaneous' # Added a general category
     ]
+    INCOME_CATEGORY = 'Salary' # The only category counted as income; everything else is an expense
 
-    def __init__(self, date_str, category, amount):
+    def __init__(self, date_str, category, amount, reference=None):
         self.date = self._validate_date(date_str)
         self.category = self._validate_category(category)
         self.amount = self._validate_amount(amount)
+        self.reference = self._validate_reference(reference) # Optional bank reference / transaction ID
 
     @staticmethod
     def _validate_date(date_str):
         """Validates and converts a date string (YYYY-MM-DD) to a date object."""
         if not isinstance(date_str, str):
             raise ValueError("Date must be a string in YYYY-MM-DD format.")
-        try:
-            # Attempt to parse the date string
-            parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            raise ValueError("Invalid date format. Please use YYYY-MM-DD (e.g., 2023-10-27).")
+        parsed_date = None
+        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+            # Fast path for strict YYYY-MM-DD, several times cheaper than strptime
+            try:
+                parsed_date = date.fromisoformat(date_str)
+            except ValueError:
+                pass # Let strptime decide, so exactly the same strings are accepted as before
+        if parsed_date is None:
+            try:
+                # Attempt to parse the date string (e.g. an unpadded 2023-1-5)
+                parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            except ValueError:
+                raise ValueError("Invalid date format. Please use YYYY-MM-DD (e.g., 2023-10-27).")
         
         # Optional: Check if date is not in the future
         if parsed_date > date.today():
@@ -52,25 +62,54 @@ class Transaction:
             raise ValueError("Amount must be positive.")
         return round(amount, 2) # Round to 2 decimal places for currency
 
+    @staticmethod
+    def _validate_reference(reference):
+        """Validates the optional reference; blank means none."""
+        if reference is None:
+            return None
+        if not isinstance(reference, str):
+            raise ValueError("Reference must be text.")
+        return reference.strip() or None
+
+    @property
+    def is_income(self):
+        return self.category == self.INCOME_CATEGORY
+
+    @property
+    def amount_cents(self):
+        """Amount in whole cents, for exact running totals."""
+        return round(self.amount * 100)
+
+    @property
+    def fingerprint(self):
+        """Identity used for duplicate detection: (date, category, amount in cents, reference)."""
+        return (self.date, self.category, self.amount_cents, self.reference)
+
     def __str__(self):
         """String representation for displaying a transaction."""
-        amount_color = Fore.RED if self.category != 'Salary' else Fore.GREEN # Different color for income
-        return (
+        amount_color = Fore.RED if not self.is_income else Fore.GREEN # Different color for income
+        text = (
             f"  {Fore.CYAN}Date:{Style.RESET_ALL} {self.date.strftime('%Y-%m-%d')} | "
             f"{Fore.CYAN}Category:{Style.RESET_ALL} {Fore.BLUE}{self.category}{Style.RESET_ALL} | "
             f"{Fore.CYAN}Amount:{Style.RESET_ALL} {amount_color}€{self.amount:.2f}{Style.RESET_ALL}"
         )
+        if self.reference:
+            text += f" | {Fore.CYAN}Ref:{Style.RESET_ALL} {self.reference}"
+        return text
 
     def to_dict(self):
         """Converts the Transaction object to a dictionary for JSON serialization."""
-        return {
+        data = {
             "date": self.date.strftime("%Y-%m-%d"), # Convert date object back to string
             "category": self.category,
             "amount": self.amount
         }
+        if self.reference is not None:
+            data["reference"] = self.reference # Only written when set, so older files stay unchanged
+        return data
 
     @classmethod
     def from_dict(cls, data):
         """Creates a Transaction object from a dictionary loaded from JSON."""
         # Note: from_dict re-validates data, which is good for robustness
-        return cls(data["date"], data["category"], data["amount"])
\ No newline at end of file
+        return cls(data["date"], data["category"], data["amount"], data.get("reference"))
\ No newline at end of file
@@ -0,0 +1,64 @@
+# apps/student_app/leaderboard.py
+
+import bisect
+
+class Leaderboard:
+    """
+    Students ordered by average, best first, as a sorted list of (-average, student_id) keys.
+    Rank and percentile lookups are O(log N) bisects and top(k) is a slice; a score change
+    re-files one student. Equal averages share a rank (1 + number of strictly better
+    averages, as in ScoreMatrix.rank) and are listed by student ID.
+    """
+
+    def __init__(self):
+        self._keys = []    # (-average, student_id), ascending = best first
+        self._by_id = {}   # student_id -> Student
+        self._filed = {}   # student_id -> key it is filed under
+
+    def __len__(self):
+        return len(self._keys)
+
+    def rebuild(self, students):
+        """Ranks a whole roster at once with a single sort."""
+        self._by_id = {s.student_id: s for s in students}
+        self._filed = {sid: (-s.average, sid) for sid, s in self._by_id.items()}
+        self._keys = sorted(self._filed.values())
+
+    def add(self, student):
+        key = (-student.average, student.student_id)
+        self._by_id[student.student_id] = student
+        self._filed[student.student_id] = key
+        bisect.insort(self._keys, key)
+
+    def remove(self, student):
+        """Drops a student, using the key it was filed under."""
+        key = self._filed.pop(student.student_id, None)
+        if key is None:
+            return
+        del self._by_id[student.student_id]
+        del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def refresh(self, student):
+        """Re-files a student after their average changed."""
+        if self._filed.get(student.student_id) != (-student.average, student.student_id):
+            self.remove(student)
+            self.add(student)
+
+    def top(self, k=10):
+        """The k best students, best first."""
+        return [self._by_id[sid] for _, sid in self._keys[:max(k, 0)]]
+
+    def rank(self, student):
+        """Class rank (1 = best), or None if the student isn't on the board."""
+        key = self._filed.get(student.student_id)
+        if key is None:
+            return None
+        # (-average,) sorts before every key with that average, so this counts better averages only
+        return bisect.bisect_left(self._keys, key[:1]) + 1
+
+    def percentile(self, student):
+        """Percentage of students whose average is at or below this student's, or None."""
+        rank = self.rank(student)
+        if rank is None:
+            return None
+        return round(100 * (len(self._keys) - rank + 1) / len(self._keys), 2)
@@ -0,0 +1,91 @@
+# apps/student_app/name_index.py
+
+import bisect
+from shared.utils import normalize_key
+
+_PREFIX_END = chr(0x10FFFF) # Sorts after any character a name can continue with
+
+class NameIndex:
+    """
+    Hash index of normalized student names for O(1) exact lookups and duplicate checks, plus
+    a sorted list of the same keys so prefix (autocomplete) queries cost O(log N + k).
+    Older files may hold names that only differ in case or spelling ('Strauß'/'Strauss'):
+    the first student keeps the key and the others wait in line behind it.
+    """
+
+    def __init__(self):
+        self._by_key = {}      # normalized name -> student that owns it
+        self._sorted_keys = [] # the same keys, in sorted order
+        self._filed = {}       # student -> key it is filed under (survives a later rename)
+        self._shadowed = {}    # key -> later students with the same key, in roster order
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def __contains__(self, name):
+        return normalize_key(name) in self._by_key
+
+    def rebuild(self, students):
+        """Indexes a whole roster at once with a single sort. Returns the students whose name
+        collides with an earlier one (they stay reachable by ID, not by name)."""
+        self._by_key = {}
+        self._filed = {}
+        self._shadowed = {}
+        for student in students:
+            self._file(student)
+        self._sorted_keys = sorted(self._by_key)
+        return [s for shadowed in self._shadowed.values() for s in shadowed]
+
+    def _file(self, student):
+        """Records a student under its key; returns True if it became the key's owner."""
+        key = normalize_key(student.name)
+        self._filed[student] = key
+        if self._by_key.setdefault(key, student) is not student:
+            self._shadowed.setdefault(key, []).append(student)
+            return False
+        return True
+
+    def add(self, student):
+        if self._file(student):
+            bisect.insort(self._sorted_keys, normalize_key(student.name))
+
+    def remove(self, student):
+        """Drops a student, using the key it was filed under. A shadowed student takes over the key."""
+        key = self._filed.pop(student, None)
+        if key is None:
+            return
+        shadowed = self._shadowed.get(key, [])
+        if self._by_key.get(key) is not student:
+            # Not the owner: just leave the queue
+            self._shadowed[key] = [s for s in shadowed if s is not student]
+            if not self._shadowed[key]:
+                del self._shadowed[key]
+        elif shadowed:
+            self._by_key[key] = shadowed.pop(0)
+            if not shadowed:
+                del self._shadowed[key]
+        else:
+            del self._by_key[key]
+            i = bisect.bisect_left(self._sorted_keys, key)
+            del self._sorted_keys[i]
+
+    def refresh(self, student):
+        """Re-files a student after a rename."""
+        if self._filed.get(student) != normalize_key(student.name):
+            self.remove(student)
+            self.add(student)
+
+    def get(self, name):
+        """The student with exactly this name (case- and spacing-insensitive), or None."""
+        return self._by_key.get(normalize_key(name))
+
+    def with_prefix(self, prefix, limit=None):
+        """Students whose name starts with `prefix`, alphabetically (at most `limit` of them)."""
+        key = normalize_key(prefix)
+        if key and prefix[-1:].isspace():
+            key += ' ' # 'Ann ' should match 'Ann Lee' but not 'Annabel'
+        i = bisect.bisect_left(self._sorted_keys, key)
+        j = bisect.bisect_right(self._sorted_keys, key + _PREFIX_END, lo=i)
+        if limit is not None:
+            j = min(j, i + limit)
+        return [self._by_key[k] for k in self._sorted_keys[i:j]]
@@ -0,0 +1,119 @@
+# apps/student_app/score_matrix.py
+
+import warnings
+from apps.student_app.student import Student
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; the rest of the student app works without it
+    np = None
+
+class ScoreMatrix:
+    """
+    Students × subjects score table for cohort statistics: one float32 row per student,
+    columns in Student.VALID_SUBJECTS order, NaN where a student doesn't take a subject.
+    Rows are added, updated and removed in O(#subjects); statistics are vectorized.
+    Each row's average is kept alongside in float64, taken from Student.average, so grades
+    and ranks agree exactly with the students' own (float32 would round some differently).
+    """
+
+    def __init__(self, students=()):
+        if np is None:
+            raise ImportError("Class statistics need NumPy (pip install numpy).")
+        self.subjects = list(Student.VALID_SUBJECTS)
+        self._column = {subject: i for i, subject in enumerate(self.subjects)}
+        students = list(students)
+        capacity = max(len(students), 16)
+        self._scores = np.full((capacity, len(self.subjects)), np.nan, dtype=np.float32)
+        self._averages = np.zeros(capacity) # Student.average of each row
+        self._ids = []       # student_id of each used row
+        self._row_of = {}    # student_id -> row
+        for student in students:
+            self.add(student)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _fill(self, row, student):
+        values = self._scores[row]
+        values[:] = np.nan
+        for subject, score in student.subjects_scores.items():
+            values[self._column[subject]] = score
+        self._averages[row] = student.average
+
+    def add(self, student):
+        row = len(self._ids)
+        if row == len(self._scores): # Full: double the capacity
+            grown = np.full((2 * row, len(self.subjects)), np.nan, dtype=np.float32)
+            grown[:row] = self._scores
+            self._scores = grown
+            self._averages = np.concatenate([self._averages, np.zeros(row)])
+        self._fill(row, student)
+        self._ids.append(student.student_id)
+        self._row_of[student.student_id] = row
+
+    def update(self, student):
+        """Rewrites a student's row after their scores changed."""
+        row = self._row_of.get(student.student_id)
+        if row is not None:
+            self._fill(row, student)
+
+    def remove(self, student_id):
+        """Drops a student's row in O(1) by moving the last row into its place."""
+        row = self._row_of.pop(student_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            self._scores[row] = self._scores[last]
+            self._averages[row] = self._averages[last]
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._row_of[moved_id] = row
+        self._scores[last] = np.nan
+        self._ids.pop()
+
+    @property
+    def values(self):
+        """The used part of the matrix (a view, not a copy)."""
+        return self._scores[:len(self._ids)]
+
+    def averages(self):
+        """Per-student averages (Student.average), in row order."""
+        return self._averages[:len(self._ids)]
+
+    def subject_stats(self, percentiles=(25, 75)):
+        """
+        {subject: {'count', 'mean', 'median', 'std', 'p<q>'...}} over the students taking
+        each subject. Subjects nobody takes have count 0 and NaN statistics.
+        """
+        values = self.values.astype(np.float64)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning) # All-NaN columns give NaN, which is the answer
+            counts = (~np.isnan(values)).sum(axis=0)
+            means = np.nanmean(values, axis=0)
+            medians = np.nanmedian(values, axis=0)
+            stds = np.nanstd(values, axis=0)
+            quantiles = np.nanpercentile(values, percentiles, axis=0) if len(values) else np.full((len(percentiles), len(self.subjects)), np.nan)
+        stats = {}
+        for i, subject in enumerate(self.subjects):
+            stats[subject] = {'count': int(counts[i]), 'mean': float(means[i]),
+                              'median': float(medians[i]), 'std': float(stds[i])}
+            for q, values_q in zip(percentiles, quantiles):
+                stats[subject][f'p{q}'] = float(values_q[i])
+        return stats
+
+    def grade_distribution(self):
+        """{grade: number of students}, from the averages and Student's grade table."""
+        grades = np.searchsorted(Student._GRADE_FLOORS, self.averages(), side='right') - 1
+        counts = np.bincount(grades, minlength=len(Student._GRADE_LETTERS))
+        # Best grade first, in VALID_GRADES order
+        return {grade: int(counts[Student._GRADE_LETTERS.index(grade)]) for grade in Student.VALID_GRADES}
+
+    def rank(self, student_id):
+        """Class rank by average (1 = best; equal averages share a rank), or None if unknown."""
+        row = self._row_of.get(student_id)
+        if row is None:
+            return None
+        averages = self.averages()
+        return int((averages > averages[row]).sum()) + 1
@@ -1,7 +1,59 @@
 # student.py
 
+import bisect
 from colorama import Fore, Style # Only for __str__ method's display
 
+class ScoreDict(dict):
+    """
+    The dict behind Student.subjects_scores. Every write is validated like the constructor's
+    input and tells the owning student, so its cached average and grade are dropped.
+    """
+
+    def __init__(self, owner, scores=()):
+        super().__init__(scores)
+        self._owner = owner
+
+    def __setitem__(self, subject, score):
+        super().__setitem__(Student._validate_subject_name(subject), Student._validate_score(score))
+        self._owner._scores_changed()
+
+    def __delitem__(self, subject):
+        super().__delitem__(subject)
+        self._owner._scores_changed()
+
+    def update(self, *args, **kwargs):
+        # Validate everything first, so a bad entry leaves the scores untouched
+        validated = {Student._validate_subject_name(subject): Student._validate_score(score)
+                     for subject, score in dict(*args, **kwargs).items()}
+        super().update(validated)
+        self._owner._scores_changed()
+
+    def setdefault(self, subject, score=None):
+        if subject not in self:
+            self[subject] = score
+        return self[subject]
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._owner._scores_changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._owner._scores_changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._owner._scores_changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        return (dict, (dict(self),)) # Copies and pickles are plain dicts
+
 class Student:
     VALID_GRADES = {
         'A': (90, 100),
@@ -11,12 +63,20 @@ class Student:
         'F': (0, 59)
     }
     VALID_SUBJECTS = ['Math', 'Science', 'English', 'History', 'Art', 'Music', 'PE', 'Computer Science'] # Example subjects
+    # Grade lookup table built once from VALID_GRADES: ascending lower bounds and their letters.
+    # Using only lower bounds leaves no gaps, so e.g. 89.5 is a B rather than falling between ranges.
+    _GRADE_BOUNDS = sorted((low, grade) for grade, (low, _) in VALID_GRADES.items())
+    _GRADE_FLOORS = [low for low, _ in _GRADE_BOUNDS]
+    _GRADE_LETTERS = [grade for _, grade in _GRADE_BOUNDS]
+    _SUBJECT_NAMES = {subject.casefold(): subject for subject in VALID_SUBJECTS} # Case-insensitive lookup
 
-    def __init__(self, name, subjects_scores):
+    def __init__(self, name, subjects_scores, student_id=None):
+        self.student_id = student_id # Stable ID assigned by StudentManager and saved with the record
         self.name = self._validate_name(name)
-        self.subjects_scores = self._validate_subjects_scores(subjects_scores)
-        self._average = self._calculate_average() # Private attribute, calculated on init
-        self._grade = self._assign_grade()       # Private attribute, calculated on init
+        self._average = None # Cached; computed on first access and dropped whenever scores change
+        self._grade = None
+        self._listener = None # Called with this student after its scores change (set by StudentManager)
+        self.subjects_scores = subjects_scores # Validated by the property setter
 
     @staticmethod
     def _validate_name(name):
@@ -35,10 +95,12 @@ class Student:
         """Validate a single subject name."""
         if not isinstance(subject, str) or not subject.strip():
             raise ValueError("Subject name cannot be empty.")
-        subject = subject.strip().title() # Capitalize for consistency
-        if subject not in Student.VALID_SUBJECTS:
+        # Map to the canonical spelling ('pe' -> 'PE'; title() would give 'Pe', which never matched)
+        canonical = Student._SUBJECT_NAMES.get(subject.strip().casefold())
+        if canonical is None:
+            subject = subject.strip().title()
             raise ValueError(f"Invalid subject: '{subject}'. Choose from: {', '.join(Student.VALID_SUBJECTS)}.")
-        return subject
+        return canonical
 
     @staticmethod
     def _validate_score(score):
@@ -63,6 +125,22 @@ class Student:
             validated_data[valid_subject] = valid_score
         return validated_data
 
+    @property
+    def subjects_scores(self):
+        """Subject -> score mapping. Changing it (replacing or editing in place) resets the cached average/grade."""
+        return self._subjects_scores
+
+    @subjects_scores.setter
+    def subjects_scores(self, subjects_scores):
+        self._subjects_scores = ScoreDict(self, self._validate_subjects_scores(subjects_scores))
+        self._scores_changed()
+
+    def _scores_changed(self):
+        self._average = None
+        self._grade = None
+        if self._listener is not None:
+            self._listener(self)
+
     def _calculate_average(self):
         """Calculate the average score."""
         if not self.subjects_scores:
@@ -71,22 +149,26 @@ class Student:
         return round(total_score / len(self.subjects_scores), 2)
 
     def _assign_grade(self):
-        """Assign a letter grade based on the average score."""
-        avg = self._average
-        for grade, (min_score, max_score) in self.VALID_GRADES.items():
-            if min_score <= avg <= max_score:
-                return grade
-        return 'N/A' # Should not happen if grades cover 0-100
+        """Assign a letter grade based on the average score (O(log grades) bisect over the table)."""
+        avg = self.average
+        i = bisect.bisect_right(self._GRADE_FLOORS, avg) - 1
+        if i < 0 or avg > 100:
+            return 'N/A' # Should not happen if scores are validated to 0-100
+        return self._GRADE_LETTERS[i]
 
     @property
     def average(self):
-        """Public getter for average, recalculates if scores change."""
-        return self._calculate_average()
+        """Public getter for average, cached until the scores change."""
+        if self._average is None:
+            self._average = self._calculate_average()
+        return self._average
 
     @property
     def grade(self):
-        """Public getter for grade, recalculates if average changes."""
-        return self._assign_grade()
+        """Public getter for grade, cached until the scores change."""
+        if self._grade is None:
+            self._grade = self._assign_grade()
+        return self._grade
 
     def __str__(self):
         subject_lines = "\n".join([
@@ -94,7 +176,7 @@ class Student:
             for sub, score in self.subjects_scores.items()
         ])
         return (
-            f"\n{Fore.CYAN}Student: {self.name}{Style.RESET_ALL}\n"
+            f"\n{Fore.CYAN}Student: {self.name}{Style.RESET_ALL} (ID: {self.student_id})\n"
             f"  {Fore.GREEN}Average Score:{Style.RESET_ALL} {self.average:.2f}\n"
             f"  {Fore.GREEN}Grade:{Style.RESET_ALL} {self.grade}\n"
             f"  {Fore.YELLOW}Subjects & Scores:{Style.RESET_ALL}\n{subject_lines}"
@@ -103,12 +185,13 @@ class Student:
     def to_dict(self):
         """Convert Student object to dictionary for JSON serialization."""
         return {
+            'id': self.student_id,
             'name': self.name,
-            'subjects_scores': self.subjects_scores,
+            'subjects_scores': dict(self.subjects_scores),
             # Average and Grade are derived, so no need to store them directly
         }
 
     @classmethod
     def from_dict(cls, data):
         """Create Student object from dictionary."""
-        return cls(data['name'], data['subjects_scores'])
\ No newline at end of file
+        return cls(data['name'], data['subjects_scores'], data.get('id')) # Older files have no 'id'; the manager assigns one
\ No newline at end of file
@@ -4,17 +4,23 @@ import json
 import os
 from pathlib import Path
 from apps.student_app.student import Student # Import the Student class
+from apps.student_app.name_index import NameIndex
+from apps.student_app.score_matrix import ScoreMatrix
+from apps.student_app.leaderboard import Leaderboard
 from colorama import Fore, Style # For print statements
 from shared.utils import get_valid_input, confirm_action # Import shared utilities
 
 
 DATA_FILE = 'students.json' 
 
-def save_students_to_file(students_list):
-    """Save a list of Student objects to JSON file."""
+def save_students_to_file(students_list, next_id=None):
+    """Save a list of Student objects, and the next free student ID, to JSON file."""
     try:
+        data = {'students': [s.to_dict() for s in students_list]}
+        if next_id is not None:
+            data['next_id'] = next_id # Kept so IDs of deleted students are never handed out again
         with open(DATA_FILE, 'w') as f:
-            json.dump([s.to_dict() for s in students_list], f, indent=4)
+            json.dump(data, f, indent=4)
         print(f"{Fore.GREEN}✓ Student data saved successfully to '{DATA_FILE}'{Style.RESET_ALL}")
         return True
     except IOError as e:
@@ -25,48 +31,128 @@ def save_students_to_file(students_list):
         return False
 
 def load_students_from_file():
-    """Load a list of Student objects from JSON file."""
+    """
+    Load Student objects from JSON file. Returns (students, next_id); next_id is None for
+    files written before it was stored (a plain list of students).
+    """
     if not Path(DATA_FILE).exists():
         print(f"{Fore.YELLOW}⚠ No student data file '{DATA_FILE}' found. Starting with an empty list.{Style.RESET_ALL}")
-        return []
+        return [], None
     
     try:
         with open(DATA_FILE, 'r') as f:
             data = json.load(f)
+        next_id = None
+        if isinstance(data, dict):
+            next_id = data.get('next_id')
+            data = data.get('students', [])
         
         # Convert dictionaries back into Student objects
         students = [Student.from_dict(s_data) for s_data in data]
         print(f"{Fore.GREEN}✓ Loaded {len(students)} students from '{DATA_FILE}'{Style.RESET_ALL}")
-        return students
+        return students, next_id if isinstance(next_id, int) else None
     except json.JSONDecodeError:
         print(f"{Fore.RED}✗ Student data file '{DATA_FILE}' is corrupted. Starting with an empty list.{Style.RESET_ALL}")
-        return []
+        return [], None
     except IOError as e:
         print(f"{Fore.RED}✗ Error loading student data: {e}{Style.RESET_ALL}")
-        return []
+        return [], None
     except Exception as e:
         print(f"{Fore.RED}✗ An unexpected error occurred while loading: {e}{Style.RESET_ALL}")
-        return []
+        return [], None
 
 class StudentManager:
     def __init__(self):
-        self.students = []
+        self._students = {} # student_id -> Student, in insertion order
+        self._next_id = 1
+        self._names = NameIndex() # Normalized name -> student, plus sorted keys for prefix search
+        self._leaderboard = Leaderboard() # Students sorted by average for top-k and rank queries
+        self._matrix = None # ScoreMatrix for class statistics, built on first use and then kept current
         self._load_initial_data()
 
     def _load_initial_data(self):
         """Loads student data when the manager is initialized."""
-        self.students = load_students_from_file()
+        self._set_students(*load_students_from_file())
+
+    def _set_students(self, students, next_id=None):
+        """
+        Replaces the roster, giving IDs to records that lack one (older files) or clash.
+        `next_id` is the saved counter; it can be ahead of the highest ID when the newest
+        students were deleted, and is never moved back, so IDs are never reused.
+        """
+        self._students = {}
+        highest = max((s.student_id for s in students if isinstance(s.student_id, int)), default=0)
+        self._next_id = max(highest + 1, next_id or 1)
+        migrated = 0
+        for student in students:
+            if not isinstance(student.student_id, int) or student.student_id in self._students:
+                student.student_id = self._next_id
+                self._next_id += 1
+                migrated += 1
+            self._students[student.student_id] = student
+            student._listener = self._scores_changed
+        if migrated:
+            print(f"{Fore.YELLOW}⚠ Assigned IDs to {migrated} student record(s); they will be stored on the next save.{Style.RESET_ALL}")
+        clashing = self._names.rebuild(students)
+        for student in clashing:
+            print(f"{Fore.YELLOW}⚠ '{student.name}' (ID: {student.student_id}) has the same name as another student; "
+                  f"look it up by ID or rename it.{Style.RESET_ALL}")
+        self._leaderboard.rebuild(students)
+        self._matrix = None
+
+    def _scores_changed(self, student):
+        """Called by a Student whenever its scores change, so derived structures follow."""
+        self._leaderboard.refresh(student)
+        if self._matrix is not None:
+            self._matrix.update(student)
+
+    def score_matrix(self):
+        """
+        Students × subjects score matrix (NumPy) for vectorized class statistics. Built on first
+        use and then updated incrementally. Raises ImportError if NumPy isn't installed.
+        """
+        if self._matrix is None:
+            self._matrix = ScoreMatrix(self._students.values())
+        return self._matrix
+
+    def top(self, k=10):
+        """The k students with the highest averages, best first."""
+        return self._leaderboard.top(k)
+
+    def rank_of(self, student):
+        """Class rank by average (1 = best; equal averages share a rank), or None if not enrolled."""
+        return self._leaderboard.rank(student)
+
+    def percentile_of(self, student):
+        """Percentage of students averaging at or below this student, or None if not enrolled."""
+        return self._leaderboard.percentile(student)
+
+    @property
+    def students(self):
+        """Read-only view of all students, in the order they were added."""
+        return self._students.values()
+
+    def get_by_id(self, student_id):
+        """The student with this ID, or None. O(1)."""
+        return self._students.get(student_id)
 
     def add_student(self, name, subjects_scores):
         """Add a new student to the manager."""
         try:
             new_student = Student(name, subjects_scores)
             # Check for duplicate student name (assuming names should be unique for simplicity)
-            if any(s.name.lower() == new_student.name.lower() for s in self.students):
+            if new_student.name in self._names: # O(1) via the name index
                 print(f"{Fore.RED}✗ Failed to add student: Student with name '{new_student.name}' already exists.{Style.RESET_ALL}")
                 return False
             
-            self.students.append(new_student)
+            new_student.student_id = self._next_id
+            self._next_id += 1
+            self._students[new_student.student_id] = new_student
+            self._names.add(new_student)
+            new_student._listener = self._scores_changed
+            self._leaderboard.add(new_student)
+            if self._matrix is not None:
+                self._matrix.add(new_student)
             print(f"{Fore.GREEN}✓ Student '{new_student.name}' added successfully.{Style.RESET_ALL}")
             self.save_data() # Save immediately after adding
             return True
@@ -88,6 +174,64 @@ class StudentManager:
             print(f"{i}. {student}")
         print(f"{Fore.CYAN}═══════════════════════════{Style.RESET_ALL}")
 
+    def get_student(self, name):
+        """The student with exactly this name (case-insensitive), or None. O(1)."""
+        return self._names.get(name)
+
+    def find_students_by_prefix(self, prefix, limit=None):
+        """Students whose name starts with `prefix` (case-insensitive), alphabetically. For autocomplete."""
+        return self._names.with_prefix(prefix, limit)
+
+    def rename_student(self, student, new_name):
+        """Validates and applies a new name, keeping the name index current. Returns True on success."""
+        try:
+            new_name = Student._validate_name(new_name)
+        except ValueError as e:
+            print(f"{Fore.RED}✗ Invalid name: {e} Name not updated.{Style.RESET_ALL}")
+            return False
+        existing = self._names.get(new_name)
+        if existing is not None and existing is not student:
+            print(f"{Fore.RED}✗ A student with name '{new_name}' already exists. Name not updated.{Style.RESET_ALL}")
+            return False
+        student.name = new_name
+        self._names.refresh(student)
+        return True
+
+    def update_by_id(self, student_id, name=None, subjects_scores=None):
+        """Updates a student's name and/or scores by ID in O(1) and saves. Returns True on success."""
+        student = self._students.get(student_id)
+        if student is None:
+            print(f"{Fore.YELLOW}No student with ID {student_id}.{Style.RESET_ALL}")
+            return False
+        if subjects_scores is not None:
+            # Validated before anything changes, so bad scores don't leave a half-applied update
+            try:
+                subjects_scores = student._validate_subjects_scores(subjects_scores)
+            except ValueError as e:
+                print(f"{Fore.RED}✗ Student not updated: {e}{Style.RESET_ALL}")
+                return False
+        if name is not None and not self.rename_student(student, name):
+            return False
+        if subjects_scores is not None:
+            student.subjects_scores = subjects_scores
+        self.save_data()
+        return True
+
+    def delete_by_id(self, student_id):
+        """Deletes a student by ID in O(1) and saves. Returns True if one was deleted."""
+        student = self._students.pop(student_id, None)
+        if student is None:
+            print(f"{Fore.YELLOW}No student with ID {student_id}.{Style.RESET_ALL}")
+            return False
+        self._names.remove(student)
+        self._leaderboard.remove(student)
+        student._listener = None
+        if self._matrix is not None:
+            self._matrix.remove(student_id)
+        self.save_data()
+        print(f"{Fore.GREEN}✓ Student '{student.name}' deleted successfully.{Style.RESET_ALL}")
+        return True
+
     def find_student_by_name(self, name):
         """Find a student by name (case-insensitive, partial match)."""
         name_lower = name.strip().lower()
@@ -108,7 +252,7 @@ class StudentManager:
         else:
             print(f"{Fore.YELLOW}Multiple students found:{Style.RESET_ALL}")
             for i, s in enumerate(found_students, 1):
-                print(f"{i}. {s.name}")
+                print(f"{i}. {s.name} (ID: {s.student_id})")
             
             choice_index = get_valid_input("Enter the number of the student to update: ", int, 
                                            lambda x: 1 <= x <= len(found_students), 
@@ -119,13 +263,9 @@ class StudentManager:
         
         new_name = input(f"Enter new name (current: {student_to_update.name}, leave blank to keep): ").strip()
         if new_name:
-            # Check for duplicate name if changed
-            if new_name.lower() != student_to_update.name.lower() and \
-               any(s.name.lower() == new_name.lower() for s in self.students if s != student_to_update):
-                print(f"{Fore.RED}✗ A student with name '{new_name}' already exists. Name not updated.{Style.RESET_ALL}")
-            else:
-                student_to_update.name = new_name
-                print(f"{Fore.GREEN}Name updated to '{new_name}'.{Style.RESET_ALL}")
+            # Validates the name and checks for duplicates through the name index
+            if self.rename_student(student_to_update, new_name):
+                print(f"{Fore.GREEN}Name updated to '{student_to_update.name}'.{Style.RESET_ALL}")
         
         # Option to update subjects/scores (this could be more elaborate)
         update_scores_choice = input("Do you want to update subjects/scores? (yes/no): ").lower().strip()
@@ -164,7 +304,7 @@ class StudentManager:
         else:
             print(f"{Fore.YELLOW}Multiple students found:{Style.RESET_ALL}")
             for i, s in enumerate(found_students, 1):
-                print(f"{i}. {s.name}")
+                print(f"{i}. {s.name} (ID: {s.student_id})")
             
             choice_index = get_valid_input("Enter the number of the student to delete: ", int, 
                                            lambda x: 1 <= x <= len(found_students), 
@@ -172,19 +312,16 @@ class StudentManager:
             student_to_delete = found_students[choice_index - 1]
 
         if confirm_action(f"Are you sure you want to delete student '{student_to_delete.name}'?"):
-            self.students = [s for s in self.students if s != student_to_delete] # Use object comparison for exact match
-            self.save_data() # Save immediately after deleting
-            print(f"{Fore.GREEN}✓ Student '{student_to_delete.name}' deleted successfully.{Style.RESET_ALL}")
-            return True
+            return self.delete_by_id(student_to_delete.student_id) # O(1) by ID, then saved
         else:
             print(f"{Fore.YELLOW}Deletion of '{student_to_delete.name}' cancelled.{Style.RESET_ALL}")
             return False
 
     def save_data(self):
         """Wrapper to save all students to file."""
-        return save_students_to_file(self.students)
+        return save_students_to_file(self.students, self._next_id)
 
     def load_data(self):
         """Wrapper to load all students from file."""
-        self.students = load_students_from_file()
+        self._set_students(*load_students_from_file())
         return True 
\ No newline at end of file
@@ -0,0 +1,55 @@
+# benchmarks/_common.py
+"""Helpers shared by the benchmark scripts. Run the scripts from the project root, e.g.
+`python benchmarks/bench_book_index.py`."""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make `apps` and `shared` importable, as main.py does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+@contextlib.contextmanager
+def scratch_dir():
+    """Runs the body in an empty temporary directory, since the apps read and write data files in the cwd."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+@contextlib.contextmanager
+def quiet():
+    """Swallows the apps' colored status lines while timing."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def best_of(func, repeat=3):
+    """Fastest of `repeat` runs of func(), in seconds (the least disturbed by other load)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def sizes_argument(description, default):
+    """Parses a --sizes option (comma-separated ints)."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--sizes', default=','.join(map(str, default)),
+                        help=f"comma-separated sizes to run (default: {','.join(map(str, default))})")
+    return [int(size) for size in parser.parse_args().sizes.split(',')]
+
+def row(*columns, widths=(34, 14, 14, 10)):
+    """Prints one aligned table row."""
+    print(''.join(str(c).ljust(w) if i == 0 else str(c).rjust(w) for i, (c, w) in enumerate(zip(columns, widths))))
+
+def ms(seconds):
+    return f"{seconds * 1000:.3f} ms"
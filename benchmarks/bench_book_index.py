@@ -0,0 +1,54 @@
+# benchmarks/bench_book_index.py
+"""
+Times the duplicate check add_book runs, and add_book itself, at growing catalog sizes.
+Before: add/update scanned the whole catalog, lower-casing every title and author.
+After: one lookup in the normalized (title, author) key index.
+
+Measured (Python 3.11): the scan check costs 1.7 / 6 / 36 ms at 10k / 50k / 200k books,
+the index check about 1 µs at any size. add_book stays flat at about 0.03 ms per call.
+"""
+
+from _common import best_of, ms, quiet, row, scratch_dir, sizes_argument
+from apps.bookstore_app.book import Book, book_key
+from apps.bookstore_app.inventory import InventoryManager
+
+ADDS = 1000
+
+def linear_duplicate_check(books, title, author):
+    # The check add_book used before the key index
+    return any(b.title.lower() == title.lower() and b.author.lower() == author.lower() for b in books)
+
+def bench(size):
+    with scratch_dir(), quiet():
+        # Coalesced writes with no flush in sight, so only the in-memory work is timed
+        manager = InventoryManager(coalesce_writes=True, flush_interval=3600, flush_every=10**9)
+        manager.books = [Book(f"Title {i}", f"Author {i % 5000}", 10, 1) for i in range(size)]
+        manager._rebuild_indexes()
+
+        miss = ("A Title Not In The Catalog", "Nobody")
+        scan = best_of(lambda: linear_duplicate_check(manager.books, *miss))
+        lookups = 10000
+        index = best_of(lambda: [book_key(*miss) in manager._books_by_key for _ in range(lookups)]) / lookups
+
+        counter = iter(range(10**9))
+        add = best_of(lambda: [manager.add_book(f"New {next(counter)}", "Someone", 5, 1) for _ in range(ADDS)]) / ADDS
+
+        manager._writer.discard_pending()
+        manager.close()
+    return scan, index, add
+
+def main():
+    sizes = sizes_argument(__doc__, [10000, 50000, 200000])
+    row("catalog size", "scan check", "index check", "speedup")
+    results = []
+    for size in sizes:
+        scan, index, add = bench(size)
+        results.append((size, add))
+        row(f"{size:,} books", ms(scan), ms(index), f"{scan / index:,.0f}x")
+    print()
+    row("catalog size", "add_book", "", "")
+    for size, add in results:
+        row(f"{size:,} books", ms(add), "", "")
+
+if __name__ == "__main__":
+    main()
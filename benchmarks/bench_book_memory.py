@@ -0,0 +1,62 @@
+# benchmarks/bench_book_memory.py
+"""
+Measures the memory each book takes in a catalog loaded from JSON.
+Before: a plain class with a per-instance __dict__, a float price and one author string per book.
+After: Book with __slots__, interned authors and integer-cent prices.
+Measured with tracemalloc after the parsed JSON is dropped, so it counts each book,
+the strings it keeps alive and its slot in the list.
+
+Measured (Python 3.11, 200k books, 2000 authors): 256 -> 165 bytes per book, 36% less.
+"""
+
+import gc
+import json
+import random
+import tracemalloc
+
+from _common import row, sizes_argument
+from apps.bookstore_app.book import Book
+
+AUTHORS = 2000
+
+class DictBook:
+    # The Book layout before __slots__ (validation left out; it doesn't change the footprint)
+    def __init__(self, title, author, price, stock):
+        self.title = title
+        self.author = author
+        self.price = round(float(price), 2)
+        self.stock = int(stock)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['title'], data['author'], data['price'], data['stock'])
+
+def catalog_json(size):
+    rng = random.Random(5)
+    return json.dumps([{'title': f"Title {i}", 'author': f"Author {rng.randrange(AUTHORS)}",
+                        'price': round(rng.uniform(1, 80), 2), 'stock': rng.randrange(100)}
+                       for i in range(size)])
+
+def bytes_per_book(book_class, text, size):
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(text) # Fresh string objects per record, as when reading books.json
+    books = [book_class.from_dict(d) for d in data]
+    del data
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(books) == size
+    return used / size
+
+def main():
+    sizes = sizes_argument(__doc__, [200000])
+    row("catalog size", "__dict__", "__slots__", "saving")
+    for size in sizes:
+        text = catalog_json(size)
+        before = bytes_per_book(DictBook, text, size)
+        after = bytes_per_book(Book, text, size)
+        row(f"{size:,} books", f"{before:.0f} B/book", f"{after:.0f} B/book", f"{1 - after / before:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# shared/append_log.py
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from colorama import Fore, Style
+from shared.utils import atomic_write_bytes
+
+def sha256_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def file_digest(path):
+    """sha256 of a file's bytes, or '' if it doesn't exist."""
+    if not Path(path).exists():
+        return ''
+    with open(path, 'rb') as f:
+        return sha256_digest(f.read())
+
+class AppendLog:
+    """
+    JSON-lines change log on top of a snapshot file. The first line, {"snapshot": sha256},
+    names the snapshot the entries apply to, so after the snapshot is rewritten a leftover
+    log is ignored instead of being applied twice. A line torn by a crash is cut off before
+    the next append. should_compact() turns true once the log is as long as the snapshot
+    (and at least `compact_min` entries), which keeps the amortized cost per entry O(1).
+    """
+
+    def __init__(self, path, snapshot_path, compact_min):
+        self.path = path
+        self.snapshot_path = snapshot_path # Only used in messages
+        self.compact_min = compact_min
+        self.snapshot_digest = '' # sha256 of the snapshot bytes the log builds on
+        self.snapshot_count = 0   # Records in that snapshot
+        self.count = 0            # Entries logged since the snapshot was written
+        self.unsynced = 0         # Entries written but not yet fsynced
+        self._file = None         # Append handle, opened on the first append
+        self._current = False     # True when the file on disk is a log for snapshot_digest
+        self._opened = False
+
+    def open(self, snapshot_digest, snapshot_count, apply):
+        """
+        Replays the log for the snapshot with this digest, calling `apply(entry)` for each
+        entry in order, and readies it for appending. Lines that don't parse (or that `apply`
+        rejects with ValueError, KeyError or TypeError) are skipped with a warning.
+        Returns the number of lines read, or None if there was no log for this snapshot.
+        """
+        self.close()
+        self.snapshot_digest = snapshot_digest
+        self.snapshot_count = snapshot_count
+        self.count = 0
+        self._opened = True
+        self._current = False
+        if not Path(self.path).exists():
+            return None
+        with open(self.path, 'rb') as f:
+            try:
+                base = json.loads(f.readline()).get("snapshot")
+            except (ValueError, AttributeError):
+                base = None
+            if base != snapshot_digest:
+                # Written for another snapshot: either compaction already folded it in and
+                # crashed before resetting the log, or the snapshot was replaced without it
+                print(f"{Fore.YELLOW}⚠ '{self.path}' does not match '{self.snapshot_path}'; ignoring it.{Style.RESET_ALL}")
+                return None
+            good_end = f.tell()
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break # Torn final write
+                good_end += len(line)
+                self.count += 1
+                try:
+                    apply(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    print(f"{Fore.YELLOW}⚠ Skipping an unreadable line in '{self.path}'.{Style.RESET_ALL}")
+        if good_end < os.path.getsize(self.path):
+            os.truncate(self.path, good_end) # Drop a torn tail so the next line starts cleanly
+        self._current = True
+        return self.count
+
+    def reset(self, snapshot_digest, snapshot_count):
+        """Atomically replaces the log with an empty one for a freshly written snapshot."""
+        self.close()
+        self.snapshot_digest = snapshot_digest
+        self.snapshot_count = snapshot_count
+        self._opened = True
+        self._start()
+
+    def _start(self):
+        atomic_write_bytes(self.path, json.dumps({"snapshot": self.snapshot_digest}).encode() + b'\n')
+        self._current = True
+        self.count = 0
+        self.unsynced = 0
+
+    def append(self, entries, sync=True):
+        """Writes entries as one block of lines; with sync=True they are fsynced before returning."""
+        if not self._opened:
+            raise IOError(f"'{self.path}' is not open; replay it first.")
+        if self._file is None:
+            if not self._current:
+                self._start() # Missing or stale: start a fresh log for this snapshot
+            self._file = open(self.path, 'ab')
+        self._file.write(b''.join(json.dumps(entry).encode() + b'\n' for entry in entries))
+        self._file.flush() # Hand it to the OS right away; fsync is up to `sync`
+        self.count += len(entries)
+        self.unsynced += len(entries)
+        if sync:
+            self.sync()
+
+    def sync(self):
+        """Forces appended lines to disk."""
+        if self._file is not None and self.unsynced:
+            os.fsync(self._file.fileno())
+        self.unsynced = 0
+
+    def should_compact(self):
+        return self.count >= max(self.compact_min, self.snapshot_count)
+
+    def close(self):
+        """Syncs and closes the append handle (the log can still be appended to afterwards)."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
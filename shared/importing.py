@@ -0,0 +1,35 @@
+# shared/importing.py
+
+class ImportReport:
+    """Summary of a bulk import: how many rows were accepted and why others were rejected."""
+
+    def __init__(self, max_reported_rejections=1000):
+        self.accepted = 0
+        self.rejected = 0
+        # Only the first few rejections are kept in detail so huge bad files can't eat memory
+        self.max_reported_rejections = max_reported_rejections
+        self.rejected_rows = [] # (row_number, reason) pairs
+
+    def accept(self, count=1):
+        """Counts `count` accepted rows (a whole chunk at once for chunked imports)."""
+        self.accepted += count
+
+    def reject(self, row_number, reason):
+        self.rejected += 1
+        if len(self.rejected_rows) < self.max_reported_rejections:
+            self.rejected_rows.append((row_number, reason))
+
+    @property
+    def total(self):
+        return self.accepted + self.rejected
+
+    def to_dict(self):
+        """Converts the report to a plain dictionary (e.g. for logging as JSON)."""
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "rejected_rows": [{"row": row, "reason": reason} for row, reason in self.rejected_rows]
+        }
+
+    def __str__(self):
+        return f"{self.accepted} accepted, {self.rejected} rejected (of {self.total} rows)"
@@ -0,0 +1,67 @@
+# shared/render.py
+
+import sys
+from itertools import islice
+from colorama import Style
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_CHUNK_SIZE = 1000 # Rows per write() when streaming a whole list
+
+def use_color(stream=None):
+    """True when `stream` (stdout by default) is a terminal, where ANSI colors make sense."""
+    stream = stream or sys.stdout
+    isatty = getattr(stream, 'isatty', None)
+    try:
+        return bool(isatty and isatty())
+    except ValueError: # Closed stream
+        return False
+
+def paint(text, *codes, color=True):
+    """Wraps text in colorama codes, or returns it untouched when color is off."""
+    if not color or not codes:
+        return text
+    return f"{''.join(codes)}{text}{Style.RESET_ALL}"
+
+def iter_pages(items, formatter, page_size=DEFAULT_PAGE_SIZE, color=True, start=1, number_codes=()):
+    """
+    Generator yielding one ready-to-write text block per page of numbered rows.
+    `formatter(item, color)` returns the text for a single item.
+    """
+    rows = iter(items)
+    number = start
+    while True:
+        page = list(islice(rows, page_size))
+        if not page:
+            return
+        lines = []
+        for item in page:
+            lines.append(f"{paint(f'{number}.', *number_codes, color=color)} {formatter(item, color)}")
+            number += 1
+        yield '\n'.join(lines) + '\n'
+
+def render_page(items, formatter, offset=0, page_size=DEFAULT_PAGE_SIZE, stream=None, color=None, number_codes=()):
+    """
+    Writes rows offset .. offset+page_size of `items` with a single write() call.
+    Only that page is formatted, so the cost depends on page size, not list size.
+    Returns the number of rows written.
+    """
+    stream = stream or sys.stdout
+    if color is None:
+        color = use_color(stream)
+    if hasattr(items, '__getitem__'):
+        page = items[offset:offset + page_size] # Lists slice directly, no need to walk the prefix
+    else:
+        page = list(islice(items, offset, offset + page_size))
+    for block in iter_pages(page, formatter, page_size, color, start=offset + 1, number_codes=number_codes):
+        stream.write(block)
+    stream.flush()
+    return len(page)
+
+def render_rows(items, formatter, stream=None, color=None, chunk_size=DEFAULT_CHUNK_SIZE, number_codes=()):
+    """Streams every row of `items`, buffering `chunk_size` rows per write()."""
+    stream = stream or sys.stdout
+    if color is None:
+        color = use_color(stream)
+    for block in iter_pages(items, formatter, chunk_size, color, number_codes=number_codes):
+        stream.write(block)
+    stream.flush()
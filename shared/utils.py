@@ -2,7 +2,9 @@
 
 from colorama import Fore, Style, init
 import sys
-import os # This import is not strictly used in this snippet, but harmless.
+import os
+import json
+import tempfile
 
 def setup_app_colors():
     """Initializes colorama for colored terminal output."""
@@ -64,4 +66,33 @@ def confirm_action(prompt):
         elif response in ['n', 'no']:
             return False
         else:
-            print(f"{Fore.RED}Invalid input. Please type 'yes' or 'no'.{Style.RESET_ALL}")
\ No newline at end of file
+            print(f"{Fore.RED}Invalid input. Please type 'yes' or 'no'.{Style.RESET_ALL}")
+
+
+def normalize_key(text):
+    """Case- and whitespace-insensitive form of a name, for duplicate checks and exact lookups."""
+    # casefold() handles more than lower() (e.g. 'ß'), and split/join collapses stray whitespace
+    return ' '.join(text.casefold().split())
+
+
+def atomic_write_bytes(path, data):
+    """Writes `data` to a temp file next to `path`, fsyncs it, then renames it over `path` in one step."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path) # Readers see either the old or the new file, never half of one
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, data, indent=4):
+    """Atomically writes `data` as JSON (see atomic_write_bytes)."""
+    atomic_write_bytes(path, json.dumps(data, indent=indent).encode())
@@ -0,0 +1,15 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make `apps` and `shared` importable, as main.py does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run every test in its own empty directory, since the apps read and write data files in the cwd."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
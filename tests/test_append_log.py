@@ -0,0 +1,69 @@
+# tests/test_append_log.py
+import json
+import os
+
+from shared.append_log import AppendLog
+
+
+def replay(log, digest='abc', count=10):
+    entries = []
+    read = log.open(digest, count, entries.append)
+    return read, entries
+
+
+def test_log_is_created_on_first_append_and_replayed():
+    log = AppendLog('changes.jsonl', 'snapshot.json', compact_min=3)
+    assert replay(log) == (None, [])
+    assert not os.path.exists('changes.jsonl') # Reading alone writes nothing
+    log.append([{'n': 1}, {'n': 2}])
+    log.close()
+
+    read, entries = replay(AppendLog('changes.jsonl', 'snapshot.json', compact_min=3))
+    assert (read, entries) == (2, [{'n': 1}, {'n': 2}])
+
+
+def test_unreadable_and_rejected_lines_are_skipped(capsys):
+    log = AppendLog('changes.jsonl', 'snapshot.json', compact_min=3)
+    replay(log)
+    log.append([{'n': 1}])
+    log.close()
+    with open('changes.jsonl', 'ab') as f:
+        f.write(b'not json\n{"n": 2}\n{"n": 3')
+
+    entries = []
+    def apply(entry):
+        if entry['n'] == 2:
+            raise ValueError("rejected")
+        entries.append(entry)
+    log = AppendLog('changes.jsonl', 'snapshot.json', compact_min=3)
+    assert log.open('abc', 10, apply) == 3
+    assert entries == [{'n': 1}]
+    assert capsys.readouterr().out.count('Skipping an unreadable line') == 2
+    with open('changes.jsonl', 'rb') as f:
+        assert f.read().endswith(b'{"n": 2}\n') # Torn tail cut off
+
+
+def test_stale_log_is_ignored_and_replaced_on_append():
+    log = AppendLog('changes.jsonl', 'snapshot.json', compact_min=3)
+    replay(log, digest='old')
+    log.append([{'n': 1}])
+    log.close()
+
+    log = AppendLog('changes.jsonl', 'snapshot.json', compact_min=3)
+    assert replay(log, digest='new') == (None, [])
+    log.append([{'n': 2}])
+    log.close()
+    with open('changes.jsonl') as f:
+        assert [json.loads(line) for line in f] == [{'snapshot': 'new'}, {'n': 2}]
+
+
+def test_compaction_threshold_follows_the_snapshot_size():
+    log = AppendLog('changes.jsonl', 'snapshot.json', compact_min=3)
+    replay(log, count=5)
+    log.append([{'n': i} for i in range(4)])
+    assert not log.should_compact()
+    log.append([{'n': 4}])
+    assert log.should_compact()
+    log.reset('def', 10)
+    assert log.count == 0 and not log.should_compact()
+    log.close()
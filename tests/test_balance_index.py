@@ -0,0 +1,79 @@
+# tests/test_balance_index.py
+import random
+from datetime import date, timedelta
+
+from apps.budget_app.balance_index import BalanceIndex
+from apps.budget_app.budget_tracker import BudgetTracker
+
+
+def brute_total(entries, ordinal):
+    return sum(cents for o, cents in entries if o <= ordinal)
+
+
+def test_totals_match_brute_force_as_the_range_grows():
+    rng = random.Random(19)
+    index = BalanceIndex()
+    entries = []
+    middle = date(2024, 6, 15).toordinal()
+    # Dates spread both ways from the first one, so the range grows at either end
+    for _ in range(300):
+        entry = (middle + rng.randint(-800, 800), rng.randint(-5000, 5000))
+        index.add(*entry)
+        entries.append(entry)
+        probe = middle + rng.randint(-900, 900)
+        assert index.total_through(probe) == brute_total(entries, probe)
+
+    low = min(o for o, _ in entries)
+    high = max(o for o, _ in entries)
+    for ordinal in range(low - 2, high + 3):
+        assert index.total_through(ordinal) == brute_total(entries, ordinal)
+
+
+def test_rebuild_matches_incremental_adds():
+    rng = random.Random(7)
+    entries = [(730000 + rng.randrange(400), rng.randint(-100, 100)) for _ in range(200)]
+    built, added = BalanceIndex(), BalanceIndex()
+    built.rebuild(entries)
+    for entry in entries:
+        added.add(*entry)
+    for ordinal in range(729990, 730410):
+        assert built.total_through(ordinal) == added.total_through(ordinal) == brute_total(entries, ordinal)
+
+
+def test_empty_index():
+    index = BalanceIndex()
+    assert index.total_through(730000) == 0
+    index.rebuild([])
+    assert index.total_through(730000) == 0
+
+
+def test_tracker_balance_follows_back_dated_adds_and_removals():
+    tracker = BudgetTracker()
+    tracker.add_transaction('2024-03-01', 'Salary', 1000)
+    tracker.add_transaction('2024-03-10', 'Food', 40)
+    assert tracker.balance_at('2024-03-31') == 960.0 # Builds the index
+
+    tracker.add_transaction('2023-12-24', 'Entertainment', 25.5)
+    tracker.add_transaction('2025-01-01', 'Salary', 10)
+    assert tracker.balance_at('2023-12-23') == 0
+    assert tracker.balance_at('2023-12-24') == -25.5
+    assert tracker.balance_at('2024-03-31') == 934.5
+    assert tracker.balance_at('2025-06-01') == 944.5
+
+    back_dated = tracker.between('2023-12-24', '2023-12-24')[0]
+    assert tracker.remove_transaction(back_dated)
+    assert tracker.balance_at('2024-03-31') == 960.0
+
+
+def test_balance_series_matches_balance_at():
+    rng = random.Random(3)
+    tracker = BudgetTracker()
+    start = date(2024, 1, 1)
+    for _ in range(100):
+        tracker.add_transaction((start + timedelta(days=rng.randrange(120))).isoformat(),
+                                rng.choice(['Salary', 'Food', 'Rent']), rng.randrange(1, 10000) / 100)
+    series = tracker.balance_series('2023-12-30', '2024-05-05', step=7)
+    assert [d for d, _ in series][:2] == [date(2023, 12, 30), date(2024, 1, 6)]
+    for day, balance in series:
+        cents = sum(t.amount_cents if t.is_income else -t.amount_cents for t in tracker.transactions if t.date <= day)
+        assert balance == cents / 100
@@ -0,0 +1,32 @@
+# tests/test_budget_limits.py
+import json
+from datetime import date
+
+from apps.budget_app.budget_limits import BudgetLimits, load_limits_from_file
+from apps.budget_app.transaction import Transaction
+
+
+def test_non_object_file_is_reported_not_raised(capsys):
+    with open('budget_limits.json', 'w') as f:
+        json.dump([['Food', 100]], f)
+    assert load_limits_from_file() == {}
+    assert 'should hold an object' in capsys.readouterr().out
+    assert BudgetLimits().limits == {}
+
+
+def test_limits_round_trip():
+    limits = BudgetLimits()
+    assert limits.set_limit('food', 150)
+    assert BudgetLimits().limits == {'Food': 150.0}
+
+
+def test_breach_fires_once_per_crossing():
+    breaches = []
+    limits = BudgetLimits(on_breach=lambda category, spent, limit: breaches.append((category, spent)))
+    limits.set_limit('Food', 10)
+    limits.reset({})
+    today = date.today().isoformat()
+    limits.record(Transaction(today, 'Food', 6), +1)
+    limits.record(Transaction(today, 'Food', 6), +1)
+    limits.record(Transaction(today, 'Food', 1), +1)
+    assert breaches == [('Food', 12.0)]
@@ -0,0 +1,48 @@
+# tests/test_budget_tracker.py
+from apps.budget_app.budget_tracker import BudgetTracker
+from apps.budget_app.partitions import PartitionedStore
+
+
+def make_tracker(**kwargs):
+    tracker = BudgetTracker(**kwargs)
+    tracker.add_transaction('2024-01-05', 'Food', 12.50)
+    tracker.add_transaction('2024-01-20', 'Salary', 2000)
+    tracker.add_transaction('2024-02-03', 'Food', 7.25)
+    return tracker
+
+
+def test_view_by_category_prints_every_category(capsys):
+    tracker = make_tracker()
+    tracker.get_transactions_by_category() # Budget menu option 3
+    out = capsys.readouterr().out
+    assert 'Category: Food (Total: €19.75)' in out
+    assert 'Category: Salary (Total: €2000.00)' in out
+
+
+def test_view_by_category_with_cold_partitioned_store(capsys):
+    make_tracker(store=PartitionedStore()).save_data()
+    tracker = BudgetTracker(store=PartitionedStore())
+    tracker.get_transactions_by_category()
+    assert 'Category: Food (Total: €19.75)' in capsys.readouterr().out
+
+
+def test_category_views_share_one_pass(monkeypatch):
+    tracker = make_tracker()
+    passes = []
+    original = BudgetTracker.transactions
+    monkeypatch.setattr(BudgetTracker, 'transactions',
+                        property(lambda self: passes.append(1) or original.fget(self)))
+    views = tracker.transactions_by_category()
+    assert [t.amount for t in views['Food']] == [12.5, 7.25]
+    assert [t.amount for t in views['Salary']] == [2000]
+    assert len(passes) == 1
+
+    tracker.add_transaction('2024-03-01', 'Food', 1.0) # A change drops the grouping
+    assert len(list(views['Food'])) == 3
+
+
+def test_partitioned_store_round_trip():
+    make_tracker(store=PartitionedStore()).save_data()
+    tracker = BudgetTracker(store=PartitionedStore())
+    assert len(tracker) == 3
+    assert [t.amount for t in tracker.between('2024-02-01', '2024-02-29')] == [7.25]
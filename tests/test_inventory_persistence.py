@@ -0,0 +1,123 @@
+# tests/test_inventory_persistence.py
+import json
+import os
+
+from apps.bookstore_app.inventory import InventoryManager, JsonBackend
+
+
+def titles(manager):
+    return sorted(b.title for b in manager.books)
+
+
+def test_changes_are_appended_not_rewritten():
+    manager = InventoryManager()
+    manager.add_book('Dune', 'Frank Herbert', 9.99, 3)
+    manager.save_data() # Snapshot with one book
+    snapshot = open('books.json').read()
+
+    manager.add_book('Emma', 'Jane Austen', 5.50, 2)
+    manager.adjust_stock(manager.get_book('Dune', 'Frank Herbert'), 4)
+    assert open('books.json').read() == snapshot # Only the change log grew
+    with open('books.changes.jsonl') as f:
+        assert len(f.readlines()) == 3 # Header + two changes
+    manager.close()
+
+    reloaded = InventoryManager()
+    assert titles(reloaded) == ['Dune', 'Emma']
+    assert reloaded.get_book('Dune', 'Frank Herbert').stock == 7
+    reloaded.close()
+
+
+def test_rename_and_delete_survive_restart():
+    manager = InventoryManager()
+    manager.add_book('Dune', 'Frank Herbert', 9.99, 3)
+    manager.add_book('Emma', 'Jane Austen', 5.50, 2)
+    manager.update_book(manager.get_book('Dune', 'Frank Herbert'), new_title='Dune Messiah')
+    manager.delete_book(manager.get_book('Emma', 'Jane Austen'))
+    manager.close()
+
+    reloaded = InventoryManager()
+    assert titles(reloaded) == ['Dune Messiah']
+    reloaded.close()
+
+
+def test_log_is_folded_back_once_long_enough():
+    manager = InventoryManager(backend=JsonBackend(compact_min=5))
+    for i in range(12):
+        manager.add_book(f'Book {i}', 'Author', 1.0, 1)
+    manager.close()
+    with open('books.json') as f:
+        assert len(json.load(f)) >= 5 # At least one compaction happened
+    assert titles(InventoryManager()) == sorted(f'Book {i}' for i in range(12))
+
+
+def test_torn_last_line_is_dropped():
+    manager = InventoryManager()
+    manager.add_book('Dune', 'Frank Herbert', 9.99, 3)
+    manager.close()
+    with open('books.changes.jsonl', 'a') as f:
+        f.write('{"book": {"title": "Em') # Crash in the middle of a write
+
+    reloaded = InventoryManager()
+    assert titles(reloaded) == ['Dune']
+    reloaded.add_book('Emma', 'Jane Austen', 5.50, 2)
+    reloaded.close()
+    assert titles(InventoryManager()) == ['Dune', 'Emma']
+
+
+def test_log_for_another_snapshot_is_ignored():
+    manager = InventoryManager()
+    manager.add_book('Dune', 'Frank Herbert', 9.99, 3)
+    manager.close()
+    with open('books.json', 'w') as f: # Replaced by hand; the log no longer applies
+        json.dump([{'title': 'Emma', 'author': 'Jane Austen', 'price': 5.5, 'stock': 2}], f)
+    assert titles(InventoryManager()) == ['Emma']
+
+
+def test_coalesced_flush_writes_only_dirty_books():
+    manager = InventoryManager(coalesce_writes=True, flush_interval=60)
+    for i in range(3):
+        manager.add_book(f'Book {i}', 'Author', 1.0, 1)
+    assert manager.commit()
+    size = os.path.getsize('books.changes.jsonl')
+    manager.adjust_stock(manager.get_book('Book 1', 'Author'), 2)
+    assert manager.commit()
+    with open('books.changes.jsonl') as f:
+        last = json.loads(f.readlines()[-1])
+    assert last['book']['title'] == 'Book 1' and last['book']['stock'] == 3
+    assert os.path.getsize('books.changes.jsonl') - size < 200 # One record, not the catalog
+    manager.close()
+
+
+def test_near_duplicates_in_a_legacy_file_are_merged_on_load(capsys):
+    with open('books.json', 'w') as f:
+        json.dump([{'title': 'Dune', 'author': 'Frank Herbert', 'price': 9.99, 'stock': 3},
+                   {'title': 'dune', 'author': 'frank  herbert', 'price': 8.99, 'stock': 5},
+                   {'title': 'Emma', 'author': 'Jane Austen', 'price': 5.50, 'stock': 2}], f)
+    manager = InventoryManager()
+    assert "Merged 'dune' by frank  herbert into 'Dune' by Frank Herbert" in capsys.readouterr().out
+    assert titles(manager) == ['Dune', 'Emma']
+
+    assert manager.adjust_stock(manager.get_book('dune', 'frank herbert'), 1)
+    manager.close()
+    with open('books.json') as f:
+        assert len(json.load(f)) == 2 # The first flush rewrote the file without the merged copy
+
+    reloaded = InventoryManager()
+    assert reloaded.get_book('Dune', 'Frank Herbert').stock == 4
+    reloaded.delete_book(reloaded.get_book('Dune', 'Frank Herbert'))
+    reloaded.close()
+    assert titles(InventoryManager()) == ['Emma'] # The merged copy doesn't come back either
+
+
+def test_dashboard_is_plain_text_when_not_a_terminal(capsys):
+    manager = InventoryManager()
+    manager.add_book('Dune', 'Frank Herbert', 9.99, 3)
+    manager.add_book('Emma', 'Jane Austen', 5.50, 1)
+    capsys.readouterr()
+    manager.view_dashboard()
+    out = capsys.readouterr().out
+    assert '\x1b[' not in out # capsys isn't a TTY, so no color codes
+    assert 'Frank Herbert: 3 units' in out
+    assert out.index('Emma') < out.index('Dune') # Lowest stock first
+    manager.close()
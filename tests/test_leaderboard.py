@@ -0,0 +1,87 @@
+# tests/test_leaderboard.py
+import json
+import random
+
+from apps.student_app.student_manager import StudentManager
+
+SUBJECTS = ['Math', 'Science', 'History']
+
+
+def write_students(records):
+    with open('students.json', 'w') as f:
+        json.dump(records, f)
+
+
+def check_board(manager):
+    """Compares every leaderboard answer with a brute-force ranking and with ScoreMatrix.rank."""
+    students = list(manager.students)
+    averages = [s.average for s in students]
+    ordered = sorted(students, key=lambda s: (-s.average, s.student_id))
+    assert manager.top(len(students) + 5) == ordered
+    assert manager.top(3) == ordered[:3]
+    matrix = manager.score_matrix()
+    for student in students:
+        rank = 1 + sum(a > student.average for a in averages)
+        assert manager.rank_of(student) == rank == matrix.rank(student.student_id)
+        at_or_below = sum(a <= student.average for a in averages)
+        assert manager.percentile_of(student) == round(100 * at_or_below / len(students), 2)
+
+
+def test_ties_share_a_rank_and_are_listed_by_id():
+    write_students([
+        {'id': 1, 'name': 'Ada', 'subjects_scores': {'Math': 80}},
+        {'id': 2, 'name': 'Ben', 'subjects_scores': {'Math': 95}},
+        {'id': 3, 'name': 'Cy', 'subjects_scores': {'Math': 80}},
+        {'id': 4, 'name': 'Dee', 'subjects_scores': {'Math': 70}},
+    ])
+    manager = StudentManager()
+    ada, ben, cy, dee = (manager.get_by_id(i) for i in (1, 2, 3, 4))
+    assert manager.top(4) == [ben, ada, cy, dee]
+    assert [manager.rank_of(s) for s in (ben, ada, cy, dee)] == [1, 2, 2, 4]
+    assert [manager.percentile_of(s) for s in (ben, ada, cy, dee)] == [100.0, 75.0, 75.0, 25.0]
+    assert manager.top(0) == []
+    check_board(manager)
+
+
+def test_board_follows_score_mutations_adds_and_deletes():
+    rng = random.Random(25)
+    write_students([{'id': i, 'name': f'Student {chr(65 + i)}',
+                     'subjects_scores': {s: rng.choice([60, 70, 80, 90]) for s in SUBJECTS}}
+                    for i in range(1, 21)])
+    manager = StudentManager()
+    manager.score_matrix() # Built now, so it has to follow every change incrementally
+    check_board(manager)
+
+    for step in range(60):
+        student = rng.choice(list(manager.students))
+        action = step % 6
+        if action == 0:
+            student.subjects_scores[rng.choice(SUBJECTS)] = rng.choice([60, 70, 80, 90])
+        elif action == 1:
+            student.subjects_scores.update({s: rng.choice([50, 100]) for s in SUBJECTS})
+        elif action == 2:
+            student.subjects_scores['Art'] = rng.choice([65, 85])
+        elif action == 3:
+            student.subjects_scores.pop('Art', None)
+        elif action == 4:
+            manager.update_by_id(student.student_id, subjects_scores={'Math': rng.choice([70, 80])})
+        elif len(manager.students) > 5:
+            manager.delete_by_id(student.student_id)
+            assert manager.rank_of(student) is None
+            assert manager.percentile_of(student) is None
+            manager.add_student(f'Newcomer {step}', {'Math': rng.choice([60, 80, 100])})
+        check_board(manager)
+
+
+def test_board_is_rebuilt_on_reload():
+    write_students([
+        {'id': 1, 'name': 'Ada', 'subjects_scores': {'Math': 80}},
+        {'id': 2, 'name': 'Ben', 'subjects_scores': {'Math': 95}},
+    ])
+    manager = StudentManager()
+    manager.get_by_id(1).subjects_scores['Math'] = 99
+    manager.save_data()
+
+    reloaded = StudentManager()
+    assert [s.student_id for s in reloaded.top(2)] == [1, 2]
+    check_board(reloaded)
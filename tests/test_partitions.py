@@ -0,0 +1,89 @@
+# tests/test_partitions.py
+import random
+from datetime import date, timedelta
+
+from apps.budget_app.budget_tracker import BudgetTracker
+from apps.budget_app.partitions import PartitionedStore
+from apps.budget_app.transaction import Transaction
+
+MONTHS = ['2024-01', '2024-02', '2024-03', '2024-04', '2024-05']
+
+
+def monthly_transactions():
+    return [Transaction(f'{month}-{day:02d}', 'Food', day) for month in MONTHS for day in (3, 17)]
+
+
+def test_unsaved_months_are_never_evicted():
+    store = PartitionedStore(cache_size=2)
+    store.open()
+    store.add_many(monthly_transactions())
+    assert list(store._cache) == MONTHS # All five are dirty, so all stay cached
+
+    assert store.flush(verbose=False)
+    assert list(store._cache) == MONTHS[-2:] # Clean now: trimmed back to the newest two
+
+    reopened = PartitionedStore(cache_size=2)
+    reopened.open()
+    assert {m: e["count"] for m, e in reopened.months.items()} == dict.fromkeys(MONTHS, 2)
+    assert [t.amount for t in reopened.between(date(2024, 1, 10), date(2024, 3, 10))] == [17, 3, 17, 3]
+
+
+def test_cache_keeps_the_most_recently_used_months():
+    store = PartitionedStore(cache_size=2)
+    store.open()
+    store.add_many(monthly_transactions())
+    store.flush(verbose=False)
+    store.open()
+
+    for month in MONTHS:
+        store.partition(month)
+        assert len(store._cache) <= 2
+        assert next(reversed(store._cache)) == month
+    store.partition('2024-04') # A hit moves it to the end, so 2024-05 goes first
+    store.partition('2024-01')
+    assert list(store._cache) == ['2024-04', '2024-01']
+
+
+def test_a_dirty_month_outlives_reads_of_other_months():
+    store = PartitionedStore(cache_size=1)
+    store.open()
+    store.add_many(monthly_transactions())
+    store.flush(verbose=False)
+    store.open()
+
+    store.add(Transaction('2024-02-20', 'Rent', 500))
+    for month in MONTHS:
+        store.partition(month)
+    assert '2024-02' in store._cache
+    store.flush(verbose=False)
+
+    store.open()
+    assert [t.amount for t in store.partition('2024-02')] == [3, 17, 500]
+
+
+def test_tracker_with_a_small_cache_matches_an_in_memory_one():
+    rng = random.Random(16)
+    start = date(2023, 1, 1)
+    cold = BudgetTracker(store=PartitionedStore(cache_size=2))
+    plain = BudgetTracker()
+    for _ in range(300):
+        args = ((start + timedelta(days=rng.randrange(540))).isoformat(),
+                rng.choice(['Salary', 'Food', 'Rent']), rng.randrange(1, 10000) / 100)
+        cold.add_transaction(*args)
+        plain.add_transaction(*args)
+        if rng.random() < 0.1:
+            cold.save_data() # Flush at random points, so clean months get evicted along the way
+    for t in plain.between('2023-06-01', '2023-06-30')[:5]:
+        assert cold.remove_transaction(t) # An equal object from another tracker
+        assert plain.remove_transaction(t)
+
+    def snapshot(tracker):
+        return ([t.to_dict() for t in tracker.between('2023-03-15', '2024-02-10')],
+                tracker.rollup('quarter'), tracker.balance_at('2023-11-30'))
+
+    assert snapshot(cold) == snapshot(plain)
+    assert cold.save_data()
+    reopened = BudgetTracker(store=PartitionedStore(cache_size=2))
+    assert len(reopened) == len(plain.transactions)
+    assert snapshot(reopened) == snapshot(plain)
+    assert [t.to_dict() for t in reopened.transactions] == [t.to_dict() for t in plain.transactions]
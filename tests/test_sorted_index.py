@@ -0,0 +1,60 @@
+# tests/test_sorted_index.py
+import random
+
+from apps.bookstore_app import sorted_index
+from apps.bookstore_app.sorted_index import SortedIndex
+
+
+class Item:
+    def __init__(self, value):
+        self.value = value
+
+
+def expected(items):
+    # Ties keep the order the items were first filed in
+    return sorted(items, key=lambda item: (item.value, item.seq))
+
+
+def test_matches_a_sorted_list_through_adds_removals_and_refreshes(monkeypatch):
+    monkeypatch.setattr(sorted_index, '_BUCKET_SIZE', 4) # Small buckets, so splits and empty buckets happen
+    rng = random.Random(7)
+    index = SortedIndex(lambda item: item.value)
+    seq = iter(range(10**6))
+    items = []
+    for i in range(40):
+        item = Item(rng.randrange(20))
+        item.seq = next(seq)
+        items.append(item)
+    index.rebuild(items)
+
+    for step in range(600):
+        action = rng.random()
+        if action < 0.4 or not items:
+            item = Item(rng.randrange(20))
+            item.seq = next(seq)
+            items.append(item)
+            index.add(item)
+        elif action < 0.7:
+            item = items.pop(rng.randrange(len(items)))
+            assert index.remove(item) is not None
+            assert index.remove(item) is None
+        else:
+            item = rng.choice(items)
+            item.value = rng.randrange(20)
+            index.refresh(item)
+
+        ordered = expected(items)
+        assert len(index) == len(items)
+        assert index.smallest(len(items) + 1) == ordered
+        assert index.smallest(3) == ordered[:3]
+        low, high = sorted(rng.randrange(22) for _ in range(2))
+        assert index.between(low, high) == [item for item in ordered if low <= item.value <= high]
+        assert index.between(low, high, limit=2) == [item for item in ordered if low <= item.value <= high][:2]
+        assert index.below(high) == [item for item in ordered if item.value < high]
+
+
+def test_empty_index():
+    index = SortedIndex(lambda item: item.value)
+    assert index.between(0, 10) == index.below(5) == index.smallest(3) == []
+    index.rebuild([])
+    assert len(index) == 0
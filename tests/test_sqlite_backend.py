@@ -0,0 +1,127 @@
+# tests/test_sqlite_backend.py
+import json
+import sqlite3
+
+from apps.bookstore_app.inventory import InventoryManager
+from apps.bookstore_app.sqlite_backend import SqliteBackend, migrate_json_to_sqlite
+
+
+def make_manager():
+    manager = InventoryManager(backend=SqliteBackend('books.db'))
+    manager.add_book('The Great Gatsby', 'F. Scott Fitzgerald', 10.0, 4)
+    manager.add_book('Great Expectations', 'Charles Dickens', 8.0, 2)
+    manager.add_book('Dune', 'Frank Herbert', 9.99, 3)
+    return manager
+
+
+def test_find_uses_the_trigram_index_and_matches_find_books():
+    manager = make_manager()
+    backend = manager._backend
+    assert backend._fts
+    plan = backend._conn.execute("EXPLAIN QUERY PLAN SELECT rowid FROM books_fts WHERE books_fts MATCH '\"great\"'").fetchall()
+    assert any('VIRTUAL TABLE INDEX' in row[-1] for row in plan)
+    for term in ('great', 'GREAT EX', 'herb', 'du', 'zzz', 'scott fitz'):
+        assert [b.title for b in backend.find(term)] == [b.title for b in manager.find_books(term)]
+    manager.close()
+
+
+def test_find_sees_updates_and_deletes():
+    manager = make_manager()
+    manager.update_book(manager.get_book('Dune', 'Frank Herbert'), new_title='Children of Dune')
+    manager.delete_book(manager.get_book('Great Expectations', 'Charles Dickens'))
+    assert [b.title for b in manager._backend.find('dune')] == ['Children of Dune']
+    assert [b.title for b in manager._backend.find('great')] == ['The Great Gatsby']
+    manager.close()
+
+
+def test_invalid_row_is_reported_not_raised(capsys):
+    make_manager().close()
+    conn = sqlite3.connect('books.db')
+    with conn:
+        conn.execute("UPDATE books SET stock = -5 WHERE title = 'Dune'")
+    conn.close()
+    backend = SqliteBackend('books.db')
+    assert backend.load() == []
+    assert 'holds an invalid book' in capsys.readouterr().out
+    backend.close()
+
+
+def test_migration_reports_merged_near_duplicates(capsys):
+    with open('books.json', 'w') as f:
+        json.dump([{'title': 'Dune', 'author': 'Frank Herbert', 'price': 9.99, 'stock': 3},
+                   {'title': 'DUNE ', 'author': 'frank  herbert', 'price': 5.0, 'stock': 1},
+                   {'title': 'Emma', 'author': 'Jane Austen', 'price': 5.5, 'stock': 2}], f)
+    assert migrate_json_to_sqlite('books.json', 'books.db') == 2
+    assert "Merged 'DUNE' by frank  herbert into 'Dune' by Frank Herbert" in capsys.readouterr().out
+    backend = SqliteBackend('books.db')
+    dune = backend.get('Dune', 'Frank Herbert')
+    assert (dune.title, dune.price, dune.stock) == ('Dune', 9.99, 3) # The first one is kept
+    backend.close()
+
+
+def test_database_from_before_the_search_index_is_indexed_on_open():
+    from apps.bookstore_app.sqlite_backend import _SCHEMA, _UPSERT, _row_params
+    conn = sqlite3.connect('books.db')
+    conn.executescript(_SCHEMA)
+    with conn:
+        conn.execute(_UPSERT, _row_params({'title': 'Dune', 'author': 'Frank Herbert', 'price': 9.99, 'stock': 3}))
+    conn.close()
+    backend = SqliteBackend('books.db')
+    assert [b.title for b in backend.find('dun')] == ['Dune']
+    backend.close()
+
+
+def test_manager_answers_queries_without_loading_the_catalog(monkeypatch):
+    make_manager().close()
+    def no_full_load(self):
+        raise AssertionError("catalog was loaded")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(SqliteBackend, 'load', no_full_load)
+        manager = InventoryManager(backend=SqliteBackend('books.db'))
+        assert len(manager) == 3
+        dune = manager.get_book('dune', 'frank herbert')
+        assert manager.get_book('Dune', 'Frank Herbert') is dune # Handed out once, then reused
+        assert [b.title for b in manager.find_books('great')] == ['The Great Gatsby', 'Great Expectations']
+        assert manager.find_books('dune') == [dune]
+        assert [b.title for b in manager.books_in_price_range(8, 10)] == ['Great Expectations', 'Dune', 'The Great Gatsby']
+        assert [b.title for b in manager.books_in_price_range(8, 10, limit=1)] == ['Great Expectations']
+        assert [b.title for b in manager.low_stock(4)] == ['Great Expectations', 'Dune']
+        assert not manager.add_book('DUNE', 'Frank  Herbert', 5, 1) # Duplicate found through the database
+
+        assert manager.adjust_stock(dune, 5)
+        assert manager.update_book(manager.get_book('Great Expectations', 'Charles Dickens'), new_price=12)
+        assert [b.title for b in manager.low_stock(4)] == ['Great Expectations']
+        assert [b.title for b in manager.books_in_price_range(11, 13)] == ['Great Expectations']
+        manager.close()
+
+    reopened = InventoryManager(backend=SqliteBackend('books.db'))
+    assert reopened.get_book('Dune', 'Frank Herbert').stock == 8
+    assert reopened.get_book('Great Expectations', 'Charles Dickens').price == 12
+    reopened.close()
+
+
+def test_unwritten_changes_are_respected_before_and_after_a_full_load():
+    make_manager().close()
+    manager = InventoryManager(backend=SqliteBackend('books.db'), coalesce_writes=True, flush_interval=3600)
+    dune = manager.get_book('Dune', 'Frank Herbert')
+    gatsby = manager.get_book('The Great Gatsby', 'F. Scott Fitzgerald')
+    assert manager.delete_book(dune)
+    assert manager.update_book(gatsby, new_title='Gatsby')
+    assert manager.add_book('Emma', 'Jane Austen', 5.5, 2)
+
+    # Nothing has been written yet, but the manager doesn't hand out stale rows
+    assert manager.get_book('Dune', 'Frank Herbert') is None
+    assert manager.get_book('The Great Gatsby', 'F. Scott Fitzgerald') is None
+    assert manager.get_book('Gatsby', 'F. Scott Fitzgerald') is gatsby
+    assert manager.add_book('Dune', 'Frank Herbert', 9.99, 1) # The key is free again
+
+    assert sorted(b.title for b in manager.books) == ['Dune', 'Emma', 'Gatsby', 'Great Expectations']
+    assert gatsby in manager.books # Full load keeps the objects already handed out
+    assert manager.get_book('Dune', 'Frank Herbert').stock == 1
+    manager.close()
+
+    reopened = InventoryManager(backend=SqliteBackend('books.db'))
+    assert sorted(b.title for b in reopened.books) == ['Dune', 'Emma', 'Gatsby', 'Great Expectations']
+    assert reopened.get_book('Dune', 'Frank Herbert').stock == 1
+    reopened.close()
@@ -0,0 +1,74 @@
+# tests/test_statement_import.py
+import io
+
+import pytest
+
+from apps.budget_app.budget_tracker import BudgetTracker
+from apps.budget_app.statement_import import _parse_amount
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('-12.50', -12.5), ('€1,200.00', 1200.0), ('(8.99)', -8.99), ('1,234,567.8', 1234567.8), ('42', 42.0),
+])
+def test_parse_amount_with_decimal_point(text, expected):
+    assert _parse_amount(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('-12,50', -12.5), ('1.200,00', 1200.0), ('€ 3,5', 3.5), ('(8,99)', -8.99),
+])
+def test_parse_amount_with_decimal_comma(text, expected):
+    assert _parse_amount(text, decimal_separator=',') == expected
+
+
+@pytest.mark.parametrize('text', ['-12,50', '1,20', '12,5000', 'abc', ''])
+def test_parse_amount_rejects_ambiguous_values(text):
+    with pytest.raises(ValueError):
+        _parse_amount(text)
+
+
+def test_european_amount_is_rejected_not_multiplied():
+    statement = io.StringIO("date,description,amount\n2024-03-01,Cafe Luna,\"-12,50\"\n2024-03-02,Cafe Luna,-3.20\n")
+    tracker = BudgetTracker()
+    report = tracker.import_statement(statement)
+    assert report.accepted == 1
+    assert len(report.rejected_rows) == 1
+    assert tracker.total_expenses == 3.2
+
+
+def test_import_with_decimal_comma():
+    statement = io.StringIO("date,description,amount\n2024-03-01,Cafe Luna,\"-12,50\"\n")
+    tracker = BudgetTracker()
+    tracker.import_statement(statement, decimal_separator=',')
+    assert tracker.total_expenses == 12.5
+
+
+def test_overlapping_statement_skips_recorded_rows_but_keeps_repeats():
+    rows = "date,description,amount\n2024-03-01,Cafe Luna,-3.20\n2024-03-01,Cafe Luna,-3.20\n2024-03-02,Payroll,1500\n"
+    tracker = BudgetTracker()
+    first = tracker.import_statement(io.StringIO(rows))
+    assert (first.accepted, first.rejected) == (3, 0) # Two equal coffees on one day are both real
+    second = tracker.import_statement(io.StringIO(rows + "2024-03-03,Cafe Luna,-3.20\n"))
+    assert (second.accepted, second.rejected) == (1, 3)
+    assert len(tracker) == 4
+
+
+def test_refund_matching_an_expense_rule_is_rejected():
+    statement = io.StringIO("date,description,amount\n2024-03-01,Amazon refund,25.00\n2024-03-02,Amazon order,-40.00\n")
+    tracker = BudgetTracker()
+    report = tracker.import_statement(statement)
+    assert (report.accepted, report.rejected) == (1, 1)
+    assert "credit of €25.00 can't be recorded as 'Shopping'" in report.rejected_rows[0][1]
+    assert (tracker.total_income, tracker.total_expenses) == (0, 40)
+
+
+def test_salary_reversal_is_rejected_for_rules_and_category_column():
+    statement = io.StringIO("date,description,amount,category\n"
+                            "2024-03-01,Salary reversal,-100.00,\n"
+                            "2024-03-02,Correction,-50.00,Salary\n"
+                            "2024-03-03,Bonus,300.00,Food\n"
+                            "2024-03-04,Payroll,2000.00,\n")
+    tracker = BudgetTracker()
+    report = tracker.import_statement(statement)
+    assert (report.accepted, report.rejected) == (1, 3)
+    assert (tracker.total_income, tracker.total_expenses) == (2000, 0)
@@ -0,0 +1,111 @@
+# tests/test_stock_ledger.py
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from apps.bookstore_app.inventory import InventoryManager
+
+REPO_ROOT = str(Path(__file__).parent.parent)
+
+SELL_AND_EXIT = f"""
+import sys
+sys.path.insert(0, {REPO_ROOT!r})
+from apps.bookstore_app.inventory import InventoryManager
+manager = InventoryManager({{coalesce}})
+manager.add_book('Dune', 'Frank Herbert', 9.99, 50)
+book = manager.get_book('Dune', 'Frank Herbert')
+for _ in range(5):
+    manager.ledger.try_decrement(book)
+# Exit without commit() or close()
+"""
+
+
+def stock_on_disk():
+    manager = InventoryManager()
+    try:
+        return manager.get_book('Dune', 'Frank Herbert').stock
+    finally:
+        manager.close()
+
+
+def run_and_exit(coalesce):
+    script = SELL_AND_EXIT.replace('{coalesce}', 'coalesce_writes=True' if coalesce else '')
+    subprocess.run([sys.executable, '-c', script], check=True, capture_output=True)
+
+
+def test_pending_sales_are_committed_at_exit():
+    run_and_exit(coalesce=False)
+    assert stock_on_disk() == 45
+
+
+def test_pending_sales_are_committed_at_exit_with_coalesced_writes():
+    run_and_exit(coalesce=True)
+    assert stock_on_disk() == 45
+
+
+def test_partial_batch_is_committed_after_max_delay():
+    manager = InventoryManager()
+    manager.add_book('Dune', 'Frank Herbert', 9.99, 50)
+    manager.ledger.max_delay = 0.05
+    manager.ledger.try_decrement(manager.get_book('Dune', 'Frank Herbert'), 3)
+    deadline = time.monotonic() + 5
+    while stock_on_disk() != 47 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert stock_on_disk() == 47
+    manager.close()
+
+
+def test_concurrent_sales_never_lose_updates_or_oversell():
+    manager = InventoryManager(coalesce_writes=True, flush_interval=0.01, flush_every=20)
+    manager.ledger.commit_every = 7 # Many small batches, committed while the sales go on
+    initial = {'Dune': 40, 'Emma': 25, 'Ulysses': 10}
+    for title, stock in initial.items():
+        manager.add_book(title, 'Author', 9.99, stock)
+    books = [manager.get_book(title, 'Author') for title in initial]
+    sold = {title: 0 for title in initial}
+    returned = {title: 0 for title in initial}
+    counts_lock = threading.Lock()
+    lowest = []
+    done = threading.Event()
+
+    def clerk(seed):
+        rng = random.Random(seed)
+        for _ in range(300):
+            book = rng.choice(books)
+            if rng.random() < 0.1:
+                manager.ledger.increment(book)
+                with counts_lock:
+                    returned[book.title] += 1
+                continue
+            quantity = rng.randint(1, 3)
+            if manager.ledger.try_decrement(book, quantity):
+                with counts_lock:
+                    sold[book.title] += quantity
+
+    def watch():
+        while not done.is_set():
+            lowest.append(min(book.stock for book in books))
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    clerks = [threading.Thread(target=clerk, args=(seed,)) for seed in range(8)]
+    for thread in clerks:
+        thread.start()
+    for thread in clerks:
+        thread.join()
+    done.set()
+    watcher.join()
+
+    assert min(lowest) >= 0
+    expected = {title: initial[title] - sold[title] + returned[title] for title in initial}
+    assert {book.title: book.stock for book in books} == expected
+    assert all(sold[title] > initial[title] for title in initial) # Every book did run out along the way
+    assert manager.close()
+
+    reloaded = InventoryManager()
+    assert {title: reloaded.get_book(title, 'Author').stock for title in initial} == expected
+    assert reloaded.stats.total_units == sum(expected.values())
+    reloaded.close()
@@ -0,0 +1,71 @@
+# tests/test_student_manager.py
+import json
+
+from apps.student_app.student_manager import StudentManager
+
+
+def write_students(records):
+    with open('students.json', 'w') as f:
+        json.dump(records, f)
+
+
+def test_colliding_names_on_load_can_both_be_deleted(capsys):
+    write_students([
+        {'id': 1, 'name': 'Anna Strauß', 'subjects_scores': {'Math': 90}},
+        {'id': 2, 'name': 'Anna Strauss', 'subjects_scores': {'Math': 80}},
+    ])
+    manager = StudentManager()
+    assert 'has the same name as another student' in capsys.readouterr().out
+    assert manager.get_student('Anna Strauss') is manager.get_by_id(1) # First one keeps the name
+
+    assert manager.delete_by_id(1)
+    assert manager.get_student('Anna Strauss') is manager.get_by_id(2) # The other takes over
+    assert manager.delete_by_id(2)
+    assert manager.get_student('Anna Strauss') is None
+    assert manager.find_students_by_prefix('anna') == []
+
+
+def test_shadowed_student_can_be_renamed_and_deleted():
+    write_students([
+        {'id': 1, 'name': 'Anna Strauß', 'subjects_scores': {'Math': 90}},
+        {'id': 2, 'name': 'Anna Strauss', 'subjects_scores': {'Math': 80}},
+    ])
+    manager = StudentManager()
+    assert manager.update_by_id(2, name='Anna Lee')
+    assert manager.get_student('Anna Lee') is manager.get_by_id(2)
+    assert manager.delete_by_id(1)
+    assert [s.name for s in manager.find_students_by_prefix('anna')] == ['Anna Lee']
+
+
+def test_ids_of_deleted_students_are_not_reused_after_reload():
+    manager = StudentManager()
+    for name in ('Ada Obi', 'Ben Eze', 'Chi Nwa'):
+        manager.add_student(name, {'Math': 70})
+    assert manager.delete_by_id(3)
+
+    manager = StudentManager() # Restart
+    manager.add_student('Dayo Ade', {'Math': 60})
+    assert manager.get_student('Dayo Ade').student_id == 4
+    assert manager.get_by_id(3) is None
+
+
+def test_legacy_list_file_still_loads():
+    write_students([{'name': 'Ada Obi', 'subjects_scores': {'Math': 70}}])
+    manager = StudentManager()
+    assert manager.get_student('Ada Obi').student_id == 1
+    manager.save_data()
+    with open('students.json') as f:
+        assert json.load(f)['next_id'] == 2
+
+
+def test_update_with_invalid_scores_changes_nothing():
+    write_students([{'id': 1, 'name': 'Anna Lee', 'subjects_scores': {'Math': 90}}])
+    manager = StudentManager()
+    assert not manager.update_by_id(1, name='Anna Smith', subjects_scores={'Math': 140})
+    student = manager.get_by_id(1)
+    assert (student.name, dict(student.subjects_scores)) == ('Anna Lee', {'Math': 90})
+    assert manager.get_student('Anna Lee') is student
+    assert manager.get_student('Anna Smith') is None
+
+    assert manager.update_by_id(1, name='Anna Smith', subjects_scores={'Math': 95})
+    assert (student.name, dict(student.subjects_scores)) == ('Anna Smith', {'Math': 95})
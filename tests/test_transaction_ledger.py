@@ -0,0 +1,88 @@
+# tests/test_transaction_ledger.py
+import json
+import shutil
+
+from apps.budget_app.budget_tracker import BudgetTracker
+from apps.budget_app.ledger import LOG_FILE, SNAPSHOT_FILE, TransactionLedger
+from apps.budget_app.transaction import Transaction
+
+
+def open_tracker(**kwargs):
+    return BudgetTracker(ledger=TransactionLedger(**kwargs))
+
+
+def rows(tracker):
+    return [t.to_dict() for t in tracker.transactions]
+
+
+def log_lines():
+    with open(LOG_FILE, 'rb') as f:
+        return f.read().splitlines()
+
+
+def test_replay_applies_appends_and_removals():
+    tracker = open_tracker()
+    tracker.add_transaction('2024-01-05', 'Food', 12.50)
+    tracker.add_transaction('2024-01-05', 'Food', 12.50) # Same entry twice: only one gets removed
+    tracker.add_transaction('2024-01-20', 'Salary', 2000)
+    tracker.add_transactions([Transaction('2023-12-31', 'Rent', 800), Transaction('2024-02-01', 'Food', 3)])
+    assert tracker.remove_transaction(tracker.between('2024-01-05', '2024-01-05')[0])
+    expected = rows(tracker)
+    tracker._ledger.close()
+
+    # Nothing was compacted: every change is still in the log, after its header
+    assert len(log_lines()) == 1 + 6
+    reopened = open_tracker()
+    assert rows(reopened) == expected
+    assert [t.amount for t in reopened.between('2024-01-05', '2024-01-05')] == [12.5]
+
+
+def test_log_is_compacted_once_it_outgrows_the_snapshot():
+    tracker = open_tracker(compact_min=3)
+    for day in range(1, 6):
+        tracker.add_transaction(f'2024-03-0{day}', 'Food', day)
+    expected = rows(tracker)
+    tracker._ledger.close()
+
+    with open(SNAPSHOT_FILE) as f:
+        assert len(json.load(f)) == 3 # Folded in on the third append
+    assert len(log_lines()) == 1 + 2
+    assert rows(open_tracker(compact_min=3)) == expected
+
+
+def test_torn_final_line_is_dropped_and_appending_resumes():
+    tracker = open_tracker()
+    tracker.add_transaction('2024-01-05', 'Food', 12.50)
+    tracker.add_transaction('2024-01-06', 'Food', 4)
+    tracker._ledger.close()
+    with open(LOG_FILE, 'ab') as f:
+        f.write(b'{"date": "2024-01-07", "categ') # Crash in the middle of a write
+
+    reopened = open_tracker()
+    assert [t.amount for t in reopened.transactions] == [12.5, 4]
+    reopened.add_transaction('2024-01-08', 'Food', 1)
+    reopened._ledger.close()
+
+    assert all(json.loads(line) for line in log_lines())
+    assert [t.amount for t in open_tracker().transactions] == [12.5, 4, 1]
+
+
+def test_log_for_an_older_snapshot_is_not_applied_twice(capsys):
+    tracker = open_tracker()
+    tracker.add_transaction('2024-01-05', 'Food', 12.50)
+    tracker.add_transaction('2024-01-06', 'Food', 4)
+    tracker._ledger.sync()
+    shutil.copy(LOG_FILE, 'old.jsonl')
+    tracker.save_data() # Compacts both entries into the snapshot
+    tracker._ledger.close()
+
+    # A crash between writing the snapshot and resetting the log leaves the old log behind
+    shutil.copy('old.jsonl', LOG_FILE)
+    reopened = open_tracker()
+    assert [t.amount for t in reopened.transactions] == [12.5, 4]
+    assert 'does not match' in capsys.readouterr().out
+
+    # The stale log was replaced by a fresh one for the current snapshot
+    reopened.add_transaction('2024-01-07', 'Food', 1)
+    reopened._ledger.close()
+    assert [t.amount for t in open_tracker().transactions] == [12.5, 4, 1]